@@ -0,0 +1,47 @@
+"""log_payloads_to_jsonb
+
+Revision ID: a3d7f1c9e5b2
+Revises: e6b3d9f2a7c4
+Create Date: 2026-10-16 20:14:52.617203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d7f1c9e5b2'
+down_revision: Union[str, None] = 'e6b3d9f2a7c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column) pairs stored as json until now
+JSON_COLUMNS = [
+    ('audit_logs', 'details'),
+    ('table_entry_audit', 'error_details'),
+    ('connection_profiles', 'capabilities'),
+    ('connection_profiles', 'db_metadata'),
+]
+
+
+def upgrade() -> None:
+    for table, column in JSON_COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=postgresql.JSONB(),
+            existing_type=sa.JSON(),
+            postgresql_using=f'{column}::jsonb'
+        )
+
+
+def downgrade() -> None:
+    for table, column in JSON_COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=sa.JSON(),
+            existing_type=postgresql.JSONB(),
+            postgresql_using=f'{column}::json'
+        )
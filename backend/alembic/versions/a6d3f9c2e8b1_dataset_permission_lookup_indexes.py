@@ -0,0 +1,28 @@
+"""dataset_permission_lookup_indexes
+
+Revision ID: a6d3f9c2e8b1
+Revises: f5c8d2a7b4e6
+Create Date: 2026-10-16 14:58:33.702519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6d3f9c2e8b1'
+down_revision: Union[str, None] = 'f5c8d2a7b4e6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_dataset_permissions_dataset_user', 'dataset_permissions', ['dataset_id', 'user_id', 'can_read'], unique=False)
+    op.create_index('ix_dataset_permissions_dataset_role', 'dataset_permissions', ['dataset_id', 'role_id', 'can_read'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_dataset_permissions_dataset_role', table_name='dataset_permissions')
+    op.drop_index('ix_dataset_permissions_dataset_user', table_name='dataset_permissions')
@@ -0,0 +1,76 @@
+"""audit_action_type_to_varchar
+
+Revision ID: b5e9c3a1d7f4
+Revises: a3d7f1c9e5b2
+Create Date: 2026-10-16 20:41:08.359126
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e9c3a1d7f4'
+down_revision: Union[str, None] = 'a3d7f1c9e5b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# AuditActionType member names, as stored by both the enum type and the string
+ACTION_TYPES = (
+    'CONNECTION_CREATE',
+    'CONNECTION_UPDATE',
+    'CONNECTION_DELETE',
+    'CONNECTION_ACTIVATE',
+    'CONNECTION_DEACTIVATE',
+    'CONNECTION_TEST',
+    'QUERY_EXECUTE',
+    'QUERY_EXPLAIN',
+    'SCHEMA_LIST',
+    'SCHEMA_ACCESS',
+    'TABLE_LIST',
+    'TABLE_ACCESS',
+    'TABLE_CREATE',
+    'TABLE_DROP',
+    'PERMISSION_GRANT',
+    'PERMISSION_REVOKE',
+    'PERMISSION_VIEW',
+    'DATA_IMPORT',
+    'DATA_EXPORT',
+    'DATA_INSERT',
+    'DATA_UPDATE',
+    'DATA_DELETE',
+    'HEALTH_CHECK',
+    'CAPABILITY_DETECT',
+    'USER_LOGIN',
+    'USER_LOGOUT',
+    'USER_LOGIN_FAILED',
+)
+
+
+def upgrade() -> None:
+    op.alter_column(
+        'audit_logs', 'action_type',
+        type_=sa.String(50),
+        existing_type=sa.Enum(*ACTION_TYPES, name='auditactiontype'),
+        existing_nullable=True,
+        postgresql_using='action_type::text'
+    )
+    op.create_check_constraint(
+        'ck_audit_logs_action_type', 'audit_logs',
+        sa.column('action_type').in_(ACTION_TYPES)
+    )
+    op.execute('DROP TYPE auditactiontype')
+
+
+def downgrade() -> None:
+    sa.Enum(*ACTION_TYPES, name='auditactiontype').create(op.get_bind())
+    op.drop_constraint('ck_audit_logs_action_type', 'audit_logs', type_='check')
+    op.alter_column(
+        'audit_logs', 'action_type',
+        type_=sa.Enum(*ACTION_TYPES, name='auditactiontype'),
+        existing_type=sa.String(50),
+        existing_nullable=True,
+        postgresql_using='action_type::auditactiontype'
+    )
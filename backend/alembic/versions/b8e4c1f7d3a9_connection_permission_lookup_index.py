@@ -0,0 +1,26 @@
+"""connection_permission_lookup_index
+
+Revision ID: b8e4c1f7d3a9
+Revises: a6d3f9c2e8b1
+Create Date: 2026-10-16 16:21:47.385104
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e4c1f7d3a9'
+down_revision: Union[str, None] = 'a6d3f9c2e8b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_connection_permissions_connection_user', 'connection_permissions', ['connection_id', 'user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_connection_permissions_connection_user', table_name='connection_permissions')
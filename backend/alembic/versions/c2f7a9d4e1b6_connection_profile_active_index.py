@@ -0,0 +1,26 @@
+"""connection_profile_active_index
+
+Revision ID: c2f7a9d4e1b6
+Revises: b8e4c1f7d3a9
+Create Date: 2026-10-16 18:24:09.518236
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2f7a9d4e1b6'
+down_revision: Union[str, None] = 'b8e4c1f7d3a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_connection_profiles_active', 'connection_profiles', ['id'], unique=False, postgresql_where=sa.text('is_active = true'))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_connection_profiles_active', table_name='connection_profiles')
@@ -0,0 +1,57 @@
+"""unique_query_history_user_hash
+
+Revision ID: c4e1a7d2f9b3
+Revises: bf32f5bbab2e
+Create Date: 2026-10-16 10:12:41.508213
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e1a7d2f9b3'
+down_revision: Union[str, None] = 'bf32f5bbab2e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Collapse duplicates left by concurrent recorders into the newest row,
+    # first folding the others' counts and count-weighted durations into it
+    op.execute("""
+        UPDATE query_history AS keep
+        SET execution_count = dup.execution_count,
+            last_executed_at = dup.last_executed_at,
+            avg_duration_ms = dup.avg_duration_ms,
+            is_saved = dup.is_saved,
+            is_favorite = dup.is_favorite
+        FROM (
+            SELECT
+                max(id) AS keep_id,
+                sum(COALESCE(execution_count, 1)) AS execution_count,
+                max(last_executed_at) AS last_executed_at,
+                round(
+                    sum(avg_duration_ms::numeric * COALESCE(execution_count, 1))
+                    / NULLIF(sum(COALESCE(execution_count, 1)) FILTER (WHERE avg_duration_ms IS NOT NULL), 0)
+                )::integer AS avg_duration_ms,
+                bool_or(is_saved) AS is_saved,
+                bool_or(is_favorite) AS is_favorite
+            FROM query_history
+            WHERE user_id IS NOT NULL AND query_hash IS NOT NULL
+            GROUP BY user_id, query_hash
+            HAVING count(*) > 1
+        ) AS dup
+        WHERE keep.id = dup.keep_id
+    """)
+    op.execute(
+        "DELETE FROM query_history a USING query_history b "
+        "WHERE a.user_id = b.user_id AND a.query_hash = b.query_hash AND a.id < b.id"
+    )
+    op.create_index('uq_query_history_user_hash', 'query_history', ['user_id', 'query_hash'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('uq_query_history_user_hash', table_name='query_history')
@@ -0,0 +1,38 @@
+"""truncate_query_history_hash
+
+Revision ID: c7a2e8f4b1d6
+Revises: b5e9c3a1d7f4
+Create Date: 2026-10-16 21:02:37.184590
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7a2e8f4b1d6'
+down_revision: Union[str, None] = 'b5e9c3a1d7f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The new hash is a prefix of the old one, so existing rows keep matching
+    op.alter_column(
+        'query_history', 'query_hash',
+        type_=sa.String(32),
+        existing_type=sa.String(64),
+        postgresql_using='left(query_hash, 32)'
+    )
+
+
+def downgrade() -> None:
+    # Stored hashes stay truncated; rows recorded before the downgrade
+    # won't be matched by full-length hashes again
+    op.alter_column(
+        'query_history', 'query_hash',
+        type_=sa.String(64),
+        existing_type=sa.String(32)
+    )
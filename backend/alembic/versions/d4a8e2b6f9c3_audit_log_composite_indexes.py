@@ -0,0 +1,48 @@
+"""audit_log_composite_indexes
+
+Revision ID: d4a8e2b6f9c3
+Revises: c2f7a9d4e1b6
+Create Date: 2026-10-16 18:52:41.263917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a8e2b6f9c3'
+down_revision: Union[str, None] = 'c2f7a9d4e1b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_audit_user_created', 'audit_logs', ['user_id', 'created_at'], unique=False)
+    op.create_index('ix_audit_resource', 'audit_logs', ['resource_type', 'resource_id'], unique=False)
+    op.create_index('ix_audit_conn_action_created', 'audit_logs', ['connection_id', 'action_type', 'created_at'], unique=False)
+    op.create_index('ix_audit_failures', 'audit_logs', ['created_at'], unique=False, postgresql_where=sa.text("status = 'failure'"))
+    op.create_index('ix_table_entry_audit_connection_created', 'table_entry_audit', ['connection_id', 'created_at'], unique=False)
+    
+    # Covered by the composites above
+    op.drop_index('ix_audit_logs_user_id', table_name='audit_logs')
+    op.drop_index('ix_audit_logs_connection_id', table_name='audit_logs')
+    op.execute('DROP INDEX IF EXISTS ix_audit_logs_resource_type')
+    op.execute('DROP INDEX IF EXISTS ix_query_history_query_hash')
+    # Never filtered on; created by create_all, so it may be absent
+    op.execute('DROP INDEX IF EXISTS ix_audit_logs_action')
+
+
+def downgrade() -> None:
+    op.create_index('ix_query_history_query_hash', 'query_history', ['query_hash'], unique=False)
+    op.create_index('ix_audit_logs_action', 'audit_logs', ['action'], unique=False)
+    op.create_index('ix_audit_logs_resource_type', 'audit_logs', ['resource_type'], unique=False)
+    op.create_index('ix_audit_logs_connection_id', 'audit_logs', ['connection_id'], unique=False)
+    op.create_index('ix_audit_logs_user_id', 'audit_logs', ['user_id'], unique=False)
+    
+    op.drop_index('ix_table_entry_audit_connection_created', table_name='table_entry_audit')
+    op.drop_index('ix_audit_failures', table_name='audit_logs')
+    op.drop_index('ix_audit_conn_action_created', table_name='audit_logs')
+    op.drop_index('ix_audit_resource', table_name='audit_logs')
+    op.drop_index('ix_audit_user_created', table_name='audit_logs')
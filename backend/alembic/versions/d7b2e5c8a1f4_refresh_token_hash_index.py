@@ -0,0 +1,33 @@
+"""refresh_token_hash_index
+
+Revision ID: d7b2e5c8a1f4
+Revises: c4e1a7d2f9b3
+Create Date: 2026-10-16 11:02:17.334905
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7b2e5c8a1f4'
+down_revision: Union[str, None] = 'c4e1a7d2f9b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('refresh_tokens', sa.Column('token_hash', sa.LargeBinary(length=32), nullable=True))
+    op.execute("UPDATE refresh_tokens SET token_hash = sha256(convert_to(token, 'UTF8'))")
+    op.alter_column('refresh_tokens', 'token_hash', nullable=False)
+    op.create_index(op.f('ix_refresh_tokens_token_hash'), 'refresh_tokens', ['token_hash'], unique=True)
+    # Lookups go through token_hash; the wide unique index on token is dead weight
+    op.drop_constraint('refresh_tokens_token_key', 'refresh_tokens', type_='unique')
+
+
+def downgrade() -> None:
+    op.create_unique_constraint('refresh_tokens_token_key', 'refresh_tokens', ['token'])
+    op.drop_index(op.f('ix_refresh_tokens_token_hash'), table_name='refresh_tokens')
+    op.drop_column('refresh_tokens', 'token_hash')
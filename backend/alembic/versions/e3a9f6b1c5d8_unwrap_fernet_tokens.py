@@ -0,0 +1,40 @@
+"""unwrap_fernet_tokens
+
+Revision ID: e3a9f6b1c5d8
+Revises: d7b2e5c8a1f4
+Create Date: 2026-10-16 11:47:52.916730
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a9f6b1c5d8'
+down_revision: Union[str, None] = 'd7b2e5c8a1f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ENCRYPTED_COLUMNS = ('encrypted_password', 'encrypted_connection_string')
+
+
+def upgrade() -> None:
+    # Strip the redundant outer base64 layer; no key needed since the
+    # Fernet token itself is untouched
+    for column in ENCRYPTED_COLUMNS:
+        op.execute(
+            f"UPDATE connection_profiles "
+            f"SET {column} = convert_from(decode({column}, 'base64'), 'UTF8') "
+            f"WHERE {column} <> '' AND {column} NOT LIKE 'gAAAAA%'"
+        )
+
+
+def downgrade() -> None:
+    for column in ENCRYPTED_COLUMNS:
+        op.execute(
+            f"UPDATE connection_profiles "
+            f"SET {column} = replace(encode(convert_to({column}, 'UTF8'), 'base64'), E'\\n', '') "
+            f"WHERE {column} LIKE 'gAAAAA%'"
+        )
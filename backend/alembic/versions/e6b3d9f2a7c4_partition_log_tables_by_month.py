@@ -0,0 +1,150 @@
+"""partition_log_tables_by_month
+
+Revision ID: e6b3d9f2a7c4
+Revises: d4a8e2b6f9c3
+Create Date: 2026-10-16 19:31:15.804372
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6b3d9f2a7c4'
+down_revision: Union[str, None] = 'd4a8e2b6f9c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# table -> (partition column, foreign keys, indexes as (name, columns, where))
+LOG_TABLES = {
+    'audit_logs': (
+        'created_at',
+        [
+            ('user_id', 'users', 'SET NULL'),
+            ('connection_id', 'connection_profiles', 'SET NULL'),
+        ],
+        [
+            ('ix_audit_logs_id', ['id'], None),
+            ('ix_audit_logs_action_type', ['action_type'], None),
+            ('ix_audit_logs_created_at', ['created_at'], None),
+            ('ix_audit_user_created', ['user_id', 'created_at'], None),
+            ('ix_audit_resource', ['resource_type', 'resource_id'], None),
+            ('ix_audit_conn_action_created', ['connection_id', 'action_type', 'created_at'], None),
+            ('ix_audit_failures', ['created_at'], "status = 'failure'"),
+        ],
+    ),
+    'connection_health_logs': (
+        'timestamp',
+        [
+            ('connection_id', 'connection_profiles', 'CASCADE'),
+        ],
+        [
+            ('ix_connection_health_logs_id', ['id'], None),
+            ('ix_connection_health_logs_connection_id', ['connection_id'], None),
+            ('ix_connection_health_logs_timestamp', ['timestamp'], None),
+            ('ix_connection_health_logs_connection_timestamp', ['connection_id', 'timestamp'], None),
+        ],
+    ),
+}
+
+# Monthly partitions created past the current month; the app tops these up
+# at startup and anything beyond lands in the DEFAULT partition
+MONTHS_AHEAD = 12
+
+
+def _rebuild(table: str, partitioned: bool) -> None:
+    """
+    Recreate table as (or back from) a monthly RANGE-partitioned table.
+
+    The id sequence is detached from the old table and reused, so ids keep
+    counting from where they were.
+    """
+    column, foreign_keys, indexes = LOG_TABLES[table]
+    old = f'{table}_old'
+
+    op.execute(f'ALTER TABLE {table} RENAME TO {old}')
+    op.execute(f'ALTER SEQUENCE {table}_id_seq OWNED BY NONE')
+
+    partition_clause = f' PARTITION BY RANGE ("{column}")' if partitioned else ''
+    op.execute(
+        f'CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+        f'{partition_clause}'
+    )
+
+    if partitioned:
+        op.execute(f'UPDATE {old} SET "{column}" = now() WHERE "{column}" IS NULL')
+        op.execute(f'ALTER TABLE {table} ALTER COLUMN "{column}" SET NOT NULL')
+        op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+        # One partition per UTC month from the oldest row through the newest
+        # row or MONTHS_AHEAD, whichever is later. Bounds carry an explicit
+        # +00 offset so they match monthly_partition_ddl in the app whatever
+        # the session time zone is.
+        op.execute(f"""
+            DO $$
+            DECLARE
+                month_start date;
+            BEGIN
+                FOR month_start IN
+                    SELECT generate_series(
+                        date_trunc('month', COALESCE((SELECT min("{column}") FROM {old}), now()) AT TIME ZONE 'UTC'),
+                        date_trunc('month', GREATEST(
+                            (SELECT max("{column}") FROM {old}),
+                            now() + interval '{MONTHS_AHEAD} months'
+                        ) AT TIME ZONE 'UTC'),
+                        interval '1 month'
+                    )::date
+                LOOP
+                    EXECUTE format(
+                        'CREATE TABLE {table}_%s PARTITION OF {table} FOR VALUES FROM (%L) TO (%L)',
+                        to_char(month_start, 'YYYY_MM'),
+                        month_start || ' 00:00+00',
+                        (month_start + interval '1 month')::date || ' 00:00+00'
+                    );
+                END LOOP;
+            END
+            $$
+        """)
+
+    op.execute(f'INSERT INTO {table} SELECT * FROM {old}')
+
+    if partitioned:
+        # Every existing row has a monthly partition; anything left in
+        # DEFAULT would block creating its month's partition later
+        op.execute(f"""
+            DO $$
+            BEGIN
+                IF EXISTS (SELECT 1 FROM {table}_default) THEN
+                    RAISE EXCEPTION '{table}_default is not empty after copying {old}';
+                END IF;
+            END
+            $$
+        """)
+    # Constraint and index names are only free once the old table is gone
+    op.execute(f'DROP TABLE {old}')
+    op.execute(f'ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id')
+
+    primary_key = f'id, "{column}"' if partitioned else 'id'
+    op.execute(f'ALTER TABLE {table} ADD PRIMARY KEY ({primary_key})')
+
+    for fk_column, referred_table, ondelete in foreign_keys:
+        op.create_foreign_key(
+            f'{table}_{fk_column}_fkey', table, referred_table,
+            [fk_column], ['id'], ondelete=ondelete
+        )
+    for name, columns, where in indexes:
+        op.create_index(
+            name, table, columns, unique=False,
+            postgresql_where=sa.text(where) if where else None
+        )
+
+
+def upgrade() -> None:
+    for table in LOG_TABLES:
+        _rebuild(table, partitioned=True)
+
+
+def downgrade() -> None:
+    for table in LOG_TABLES:
+        _rebuild(table, partitioned=False)
@@ -0,0 +1,26 @@
+"""health_log_connection_timestamp_index
+
+Revision ID: f5c8d2a7b4e6
+Revises: e3a9f6b1c5d8
+Create Date: 2026-10-16 14:21:06.187342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5c8d2a7b4e6'
+down_revision: Union[str, None] = 'e3a9f6b1c5d8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_connection_health_logs_connection_timestamp', 'connection_health_logs', ['connection_id', 'timestamp'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_connection_health_logs_connection_timestamp', table_name='connection_health_logs')
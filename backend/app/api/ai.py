@@ -56,11 +56,15 @@ async def natural_language_to_sql(
     tables_schema = {}
     
     if request.dataset_ids:
+        readable = DatasetAccessChecker.filter_readable(db, current_user, request.dataset_ids)
+        table_names = dict(
+            db.query(Dataset.id, Dataset.virtual_table_name).filter(Dataset.id.in_(readable))
+        ) if readable else {}
         for dataset_id in request.dataset_ids:
-            dataset = db.query(Dataset).filter(Dataset.id == dataset_id).first()
-            if dataset and DatasetAccessChecker.can_read(db, current_user, dataset):
-                schema = sql_engine.get_table_schema(dataset.virtual_table_name)
-                tables_schema[dataset.virtual_table_name] = schema
+            if dataset_id in table_names:
+                table_name = table_names[dataset_id]
+                schema = sql_engine.get_table_schema(table_name)
+                tables_schema[table_name] = schema
     else:
         # Get all accessible tables
         tables = sql_engine.list_tables()
@@ -9,7 +9,7 @@ from pydantic import BaseModel
 from app.database import get_db
 from app.database import get_db
 from app.models.ai_config import AIConfig
-from app.core.rbac import get_current_active_user
+from app.core.rbac import get_current_user
 from app.services.ai_providers import create_provider, AIProviderError
 from app.services.ai_service import AIService
 from app.config import settings
@@ -50,14 +50,14 @@ PROVIDERS = [
 ]
 
 @router.get("/providers", response_model=List[AIProviderInfo])
-async def get_providers(current_user = Depends(get_current_active_user)):
+async def get_providers(current_user = Depends(get_current_user)):
     """List available AI providers."""
     return PROVIDERS
 
 @router.get("/config", response_model=List[AIConfigResponse])
 async def get_configs(
     db: Session = Depends(get_db),
-    current_user = Depends(get_current_active_user)
+    current_user = Depends(get_current_user)
 ):
     """Get all AI configurations."""
     configs = db.query(AIConfig).order_by(AIConfig.id.desc()).all()
@@ -66,7 +66,7 @@ async def get_configs(
 @router.get("/config/active", response_model=AIConfigResponse | None)
 async def get_active_config(
     db: Session = Depends(get_db),
-    current_user = Depends(get_current_active_user)
+    current_user = Depends(get_current_user)
 ):
     """Get currently active AI configuration."""
     config = db.query(AIConfig).filter(AIConfig.is_active == True).first()
@@ -80,7 +80,7 @@ async def get_active_config(
 async def create_config(
     config_in: AIConfigCreate,
     db: Session = Depends(get_db),
-    current_user = Depends(get_current_active_user)
+    current_user = Depends(get_current_user)
 ):
     """Create or update AI configuration."""
     # If active, deactivate others
@@ -107,7 +107,7 @@ async def create_config(
 @router.post("/test")
 async def test_connection(
     config_in: AIConfigCreate,
-    current_user = Depends(get_current_active_user)
+    current_user = Depends(get_current_user)
 ):
     """Test connection with provided credentials."""
     try:
@@ -140,7 +140,7 @@ async def list_models(
     api_key: str | None = None,
     api_url: str | None = None,
     db: Session = Depends(get_db),
-    current_user = Depends(get_current_active_user)
+    current_user = Depends(get_current_user)
 ):
     """Fetch available models for a provider on-the-fly."""
     try:
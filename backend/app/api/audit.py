@@ -17,6 +17,14 @@ from app.api.auth import get_current_user
 
 router = APIRouter(prefix="/audit", tags=["audit"])
 
+# Columns written by the audit exports; exports run up to 10k rows, so they
+# select plain rows instead of AuditLog objects
+_EXPORT_CSV_COLUMNS = [
+    "id", "created_at", "user_email", "connection_name", "action",
+    "resource_type", "resource_name", "status", "duration_ms", "ip_address",
+]
+_EXPORT_JSON_COLUMNS = _EXPORT_CSV_COLUMNS + ["action_type", "details"]
+
 
 # Pydantic models
 class AuditLogResponse(BaseModel):
@@ -159,7 +167,8 @@ async def export_audit_logs(
         connection_id=connection_id,
         start_date=start_date,
         end_date=end_date,
-        limit=10000  # Max export limit
+        limit=10000,  # Max export limit
+        columns=_EXPORT_CSV_COLUMNS if format == "csv" else _EXPORT_JSON_COLUMNS
     )
     
     if format == "csv":
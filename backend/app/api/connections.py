@@ -7,7 +7,7 @@ from typing import List, Optional
 from datetime import datetime
 from pydantic import BaseModel
 
-from app.database import get_app_db
+from app.database import get_app_db, user_db_manager
 from app.models import User, ConnectionProfile
 from app.models.connection import ConnectionType, ConnectionGroup, ConnectionMode, HealthStatus
 from app.models.audit import AuditActionType, TableEntryAudit
@@ -325,6 +325,8 @@ async def update_connection(
     
     db.commit()
     db.refresh(profile)
+    # Pooled User DB engines for the old settings are no longer reachable
+    user_db_manager.invalidate()
     
     # Audit log with new service
     await audit_service.log_action(
@@ -400,6 +402,7 @@ async def delete_connection(
 
         db.delete(profile)
         db.commit()
+        user_db_manager.invalidate()
     except Exception as e:
         db.rollback()
         import traceback
@@ -436,6 +439,7 @@ async def activate_connection(
     profile.is_active = True
     db.commit()
     db.refresh(profile)
+    user_db_manager.invalidate()
     
     # Audit log
     await audit_service.log_action(
@@ -529,7 +533,10 @@ async def get_health_history(
             detail="Connection profile not found"
         )
     
-    history = health_monitor.get_health_history(db, connection_id, hours)
+    history = health_monitor.get_health_history(
+        db, connection_id, hours,
+        columns=["timestamp", "status", "response_time_ms", "error_message", "checked_by"]
+    )
     
     return {
         "connection_id": profile.id,
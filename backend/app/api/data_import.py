@@ -10,7 +10,7 @@ import structlog
 
 from app.database import get_app_db
 from app.models import User, Dataset, ConnectionProfile, ImportJob, ImportMapping
-from app.core.rbac import get_current_active_user
+from app.core.rbac import get_current_user
 from app.services.data_import.import_service import ImportService
 from app.services.data_import.execution_engine import ExecutionEngine
 from app.core.crypto import decrypt_value
@@ -63,7 +63,7 @@ class SaveMappingRequest(BaseModel):
 @router.get("/datasets")
 async def list_import_datasets(
     db: Session = Depends(get_app_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """List available datasets for import"""
     datasets = db.query(Dataset).filter(
@@ -89,7 +89,7 @@ async def list_import_datasets(
 async def get_dataset_columns(
     dataset_id: int,
     db: Session = Depends(get_app_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Get dataset column information"""
     dataset = db.query(Dataset).filter(Dataset.id == dataset_id).first()
@@ -113,7 +113,7 @@ async def get_dataset_columns(
 @router.get("/connections")
 async def list_import_connections(
     db: Session = Depends(get_app_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """List available database connections for import"""
     connections = db.query(ConnectionProfile).filter(
@@ -141,7 +141,7 @@ async def list_import_connections(
 async def list_schemas(
     connection_id: int,
     db: Session = Depends(get_app_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """List schemas in database connection"""
     connection = db.query(ConnectionProfile).filter(
@@ -175,7 +175,7 @@ async def list_tables(
     connection_id: int,
     schema: str = "public",
     db: Session = Depends(get_app_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """List tables in schema"""
     connection = db.query(ConnectionProfile).filter(
@@ -210,7 +210,7 @@ async def get_table_columns(
     table_name: str,
     schema: str = "public",
     db: Session = Depends(get_app_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Get columns from a specific table"""
     connection = db.query(ConnectionProfile).filter(
@@ -245,7 +245,7 @@ async def get_table_schema(
     connection_id: int,
     schema: str = "public",
     db: Session = Depends(get_app_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Get table schema information"""
     import_service = ImportService(db)
@@ -265,7 +265,7 @@ async def create_auto_mapping(
     table_name: str,
     schema: str = "public",
     db: Session = Depends(get_app_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Create automatic column mapping"""
     import_service = ImportService(db)
@@ -291,7 +291,7 @@ async def validate_import(
     schema: str,
     mappings: List[ColumnMappingItem],
     db: Session = Depends(get_app_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Validate import configuration"""
     import_service = ImportService(db)
@@ -324,7 +324,7 @@ class PreviewImportRequest(BaseModel):
 async def preview_import(
     request: PreviewImportRequest,
     db: Session = Depends(get_app_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Preview import data with mappings"""
     import_service = ImportService(db)
@@ -345,7 +345,7 @@ async def preview_import(
 async def create_import_job(
     request: CreateImportJobRequest,
     db: Session = Depends(get_app_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Create and execute import job"""
     # Create job record
@@ -384,7 +384,7 @@ async def create_import_job(
 async def list_import_jobs(
     limit: int = 50,
     db: Session = Depends(get_app_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """List import jobs"""
     jobs = db.query(ImportJob).filter(
@@ -417,7 +417,7 @@ async def list_import_jobs(
 async def get_import_job(
     job_id: int,
     db: Session = Depends(get_app_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Get import job details"""
     job = db.query(ImportJob).filter(
@@ -453,7 +453,7 @@ async def get_import_job(
 async def save_mapping_template(
     request: SaveMappingRequest,
     db: Session = Depends(get_app_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Save column mapping template"""
     mapping = ImportMapping(
@@ -477,7 +477,7 @@ async def save_mapping_template(
 @router.get("/mappings")
 async def list_mapping_templates(
     db: Session = Depends(get_app_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """List saved mapping templates"""
     mappings = db.query(ImportMapping).filter(
@@ -505,7 +505,7 @@ async def list_mapping_templates(
 async def delete_mapping_template(
     mapping_id: int,
     db: Session = Depends(get_app_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Delete mapping template"""
     mapping = db.query(ImportMapping).filter(
@@ -2,7 +2,7 @@
 Dataset API Routes
 """
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query, Body
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only
 from typing import List, Optional, Dict, Any
 import json
 
@@ -22,6 +22,12 @@ logger = structlog.get_logger()
 
 router = APIRouter()
 
+# Columns serialized by DatasetListResponse; skips the JSON/Text columns
+_DATASET_LIST_LOAD = load_only(
+    Dataset.id, Dataset.name, Dataset.description, Dataset.file_type, Dataset.row_count,
+    Dataset.status, Dataset.owner_id, Dataset.is_public, Dataset.created_at
+)
+
 
 @router.get("/", response_model=List[DatasetListResponse])
 async def list_datasets(
@@ -31,8 +37,8 @@ async def list_datasets(
     db: Session = Depends(get_db)
 ):
     """List all accessible datasets."""
-    # Get datasets owned by user or public
-    query = db.query(Dataset).filter(
+    # Get datasets owned by user or public, loading only the listed columns
+    query = db.query(Dataset).options(_DATASET_LIST_LOAD).filter(
         (Dataset.owner_id == current_user.id) | (Dataset.is_public == True)
     )
     
@@ -15,7 +15,7 @@ import os
 
 from app.database import get_app_db, get_app_db_context
 from app.models import User, ScheduledJob, JobExecution, JobType, JobStatus, ConnectionProfile
-from app.core.rbac import get_current_active_user, require_permission
+from app.core.rbac import get_current_user, require_permission
 from app.services.jobs.job_manager import JobManager
 from app.services.jobs.job_scheduler import JobScheduler
 from app.services.jobs.procedure_executor import ProcedureExecutor
@@ -89,7 +89,7 @@ class QuickBackupRequest(BaseModel):
 async def create_job(
     request: CreateJobRequest,
     db: Session = Depends(get_app_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Create a new scheduled job"""
     logger.info("create_job_request", job_type=request.job_type, user_id=current_user.id)
@@ -121,7 +121,7 @@ async def list_jobs(
     limit: int = Query(50, le=200),
     offset: int = 0,
     db: Session = Depends(get_app_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """List scheduled jobs with filters"""
     query = db.query(ScheduledJob)
@@ -178,7 +178,7 @@ async def list_jobs(
 async def get_job(
     job_id: int,
     db: Session = Depends(get_app_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Get job details"""
     job = db.query(ScheduledJob).filter(ScheduledJob.id == job_id).first()
@@ -223,7 +223,7 @@ async def update_job(
     job_id: int,
     request: UpdateJobRequest,
     db: Session = Depends(get_app_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Update job configuration"""
     job = db.query(ScheduledJob).filter(ScheduledJob.id == job_id).first()
@@ -258,7 +258,7 @@ async def update_job(
 async def delete_job(
     job_id: int,
     db: Session = Depends(get_app_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Delete a job"""
     job = db.query(ScheduledJob).filter(ScheduledJob.id == job_id).first()
@@ -340,12 +340,8 @@ async def download_backup(
     logger.info("download_backup_request", job_id=job_id, execution_id=execution_id, file_path=file_path)
     
     if not os.path.exists(file_path):
-        # List directory to help debug
         dir_path = os.path.dirname(file_path)
-        if os.path.exists(dir_path):
-            logger.info("directory_contents", dir=dir_path, files=os.listdir(dir_path))
-        else:
-            logger.error("directory_not_found", dir=dir_path)
+        logger.error("backup_file_not_found", file_path=file_path, dir_exists=os.path.isdir(dir_path))
             
         raise HTTPException(status_code=404, detail=f"Backup file not found on server: {file_path}")
         
@@ -377,7 +373,7 @@ async def download_backup(
 async def toggle_job(
     job_id: int,
     db: Session = Depends(get_app_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Enable or disable a job"""
     job = db.query(ScheduledJob).filter(ScheduledJob.id == job_id).first()
@@ -402,7 +398,7 @@ async def toggle_job(
 async def execute_job(
     job_id: int,
     db: Session = Depends(get_app_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Trigger manual job execution"""
     logger.info("manual_job_execution", job_id=job_id, user_id=current_user.id)
@@ -429,7 +425,7 @@ async def cancel_job_execution(
     job_id: int,
     execution_id: int,
     db: Session = Depends(get_app_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Cancel a running job execution"""
     try:
@@ -455,7 +451,7 @@ async def list_job_executions(
     limit: int = Query(50, le=200),
     offset: int = 0,
     db: Session = Depends(get_app_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """List job execution history"""
     # Verify job exists
@@ -496,7 +492,7 @@ async def get_execution_details(
     job_id: int,
     execution_id: int,
     db: Session = Depends(get_app_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Get detailed execution information"""
     execution = db.query(JobExecution).filter(
@@ -534,7 +530,7 @@ async def get_execution_logs(
     job_id: int,
     execution_id: int,
     db: Session = Depends(get_app_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Get execution logs"""
     execution = db.query(JobExecution).filter(
@@ -560,7 +556,7 @@ async def discover_procedures(
     connection_id: int,
     schema: str = 'public',
     db: Session = Depends(get_app_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Discover stored procedures and functions in a schema"""
     # Get connection
@@ -592,7 +588,7 @@ async def get_procedure_parameters(
     connection_id: int,
     schema: str = 'public',
     db: Session = Depends(get_app_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Get parameters for a specific procedure"""
     # Get connection
@@ -629,7 +625,7 @@ async def get_procedure_parameters(
 async def quick_backup(
     request: QuickBackupRequest,
     db: Session = Depends(get_app_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Execute one-click database backup"""
     logger.info("quick_backup_request", connection_id=request.connection_id, user_id=current_user.id)
@@ -679,7 +675,7 @@ async def preview_next_runs(
     job_id: int,
     count: int = Query(5, le=20),
     db: Session = Depends(get_app_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Preview next N run times for a scheduled job"""
     job = db.query(ScheduledJob).filter(ScheduledJob.id == job_id).first()
@@ -707,7 +703,7 @@ async def preview_next_runs(
 @router.post("/schedule/validate")
 async def validate_cron(
     cron_expression: str,
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Validate a cron expression"""
     is_valid, error = JobScheduler.validate_cron_expression(cron_expression)
@@ -737,7 +733,7 @@ async def validate_cron(
 @require_permission("jobs:manage")
 async def list_system_directories(
     path: Optional[str] = None,
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """List directories in the file system (restricted access)"""
     import os
@@ -807,7 +803,7 @@ async def list_system_directories(
 
 @router.get("/schedule/presets")
 async def get_cron_presets(
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user)
 ):
     """Get common cron expression presets"""
     presets = [
@@ -163,7 +163,7 @@ async def list_mongodb_collections(
         
         # List collections (tables)
         schema = profile.database
-        collections = connector.list_tables(schema)
+        collections = connector.list_tables(schema, include_size=True)
         
         return {
             "collections": [
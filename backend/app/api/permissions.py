@@ -3,7 +3,7 @@ Connection Permissions API
 Manage user permissions for database connections
 """
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from typing import List
 from pydantic import BaseModel
 from datetime import datetime
@@ -207,18 +207,17 @@ async def list_connection_permissions(
         )
     
     # Get all permissions for connection
-    permissions = db.query(ConnectionPermission).filter(
+    permissions = db.query(ConnectionPermission).options(
+        selectinload(ConnectionPermission.user)
+    ).filter(
         ConnectionPermission.connection_id == connection_id
     ).all()
     
     # Add user emails
-    result = []
     for perm in permissions:
-        user = db.query(User).filter(User.id == perm.user_id).first()
-        perm.user_email = user.email if user else "Unknown"
-        result.append(perm)
+        perm.user_email = perm.user.email if perm.user else "Unknown"
     
-    return result
+    return permissions
 
 
 @router.get("/users/{user_id}/connection-permissions", response_model=List[PermissionResponse])
@@ -4,9 +4,10 @@ Setup API for initial configuration
 from fastapi import APIRouter, HTTPException, status, Body
 from pydantic import BaseModel
 from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
 import structlog
 from app.config import settings
-from app.database import Base, app_engine, get_app_db_context, AppSessionLocal
+from app.database import Base, app_engine, get_app_db_context, AppSessionLocal, user_db_manager
 from app.core.rbac import initialize_rbac
 from app.core.crypto import encrypt_value
 
@@ -31,8 +32,8 @@ async def test_connection(request: ConnectionTestRequest):
     url = f"postgresql://{request.user}:{request.password}@{request.host}:{request.port}/postgres"
     
     try:
-        # Create temp engine to list DBs
-        temp_engine = create_engine(url, connect_args={'connect_timeout': 5})
+        # Create temp engine to list DBs; NullPool closes its one connection on exit
+        temp_engine = create_engine(url, poolclass=NullPool, connect_args={'connect_timeout': 5})
         with temp_engine.connect() as conn:
             # List only user databases, excluding templates
             result = conn.execute(text("SELECT datname FROM pg_database WHERE datistemplate = false;"))
@@ -62,7 +63,7 @@ async def configure_database(request: ConfigureRequest):
     
     try:
         # 1. Verify connection to specific DB
-        temp_engine = create_engine(url, connect_args={'connect_timeout': 5})
+        temp_engine = create_engine(url, poolclass=NullPool, connect_args={'connect_timeout': 5})
         with temp_engine.connect() as conn:
             conn.execute(text("SELECT 1"))
         
@@ -110,6 +111,7 @@ async def configure_database(request: ConfigureRequest):
                 db.add(new_conn)
             
             db.commit()
+            user_db_manager.invalidate()
             
         finally:
             db.close()
@@ -2,10 +2,15 @@
 SQL Execution API Routes - DUAL DATABASE ARCHITECTURE
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Body, Query
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from sqlalchemy.orm import Session
-from sqlalchemy import Connection, text
-from typing import List, Optional
+from sqlalchemy import Connection, CursorResult, text
+from contextlib import ExitStack
+from typing import Iterator, List, Optional
+import json
 import time
+import structlog
 
 from app.database import get_app_db, user_db_manager
 from app.schemas import (
@@ -17,6 +22,10 @@ from app.core.rbac import get_current_user
 from app.core.audit import AuditLogger, QueryHistoryManager
 
 router = APIRouter()
+logger = structlog.get_logger()
+
+# Rows per NDJSON line written by /execute/stream
+STREAM_CHUNK_SIZE = 1000
 
 
 def execute_user_query(user_conn: Connection, query: str, limit: int = 1000) -> SQLResult:
@@ -84,6 +93,19 @@ def execute_user_query(user_conn: Connection, query: str, limit: int = 1000) ->
         )
 
 
+def stream_user_result(result: CursorResult, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Render a streamed User DB result as NDJSON.
+    
+    The first line carries the column names, each following line a chunk of
+    rows as value lists, so at most one chunk is held in memory.
+    """
+    keys = list(result.keys())
+    yield json.dumps({"columns": keys}) + "\n"
+    for partition in result.partitions(chunk_size):
+        yield json.dumps({"rows": [list(row) for row in partition]}, default=str) + "\n"
+
+
 @router.post("/execute")
 async def execute_sql(
     request: SQLRequest = Body(...),
@@ -112,31 +134,34 @@ async def execute_sql(
             # Execute query on User DB
             result = execute_user_query(user_conn, request.query, request.limit)
             
-            # Audit log to App DB
+            # Audit log to App DB; best effort, so each write gets its own
+            # SAVEPOINT and a failure can't poison the request's final commit
             try:
-                auditor = AuditLogger(app_db)
-                auditor.log_query(
-                    user=current_user,
-                    query=request.query,
-                    duration_ms=result.execution_time_ms,
-                    rows_affected=result.rows_affected or result.row_count,
-                    success=result.success,
-                    error=result.error_message,
-                    connection_id=request.connection_id
-                )
+                with app_db.begin_nested():
+                    auditor = AuditLogger(app_db)
+                    auditor.log_query(
+                        user=current_user,
+                        query=request.query,
+                        duration_ms=result.execution_time_ms,
+                        rows_affected=result.rows_affected or result.row_count,
+                        success=result.success,
+                        error=result.error_message,
+                        connection_id=request.connection_id
+                    )
             except Exception as e:
                 print(f"AUDIT LOG FAILED: {str(e)}")
             
             # Record in query history (App DB)
             if result.success:
                 try:
-                    history_manager = QueryHistoryManager(app_db)
-                    history_manager.record_query(
-                        user_id=current_user.id,
-                        query=request.query,
-                        duration_ms=result.execution_time_ms,
-                        connection_id=request.connection_id
-                    )
+                    with app_db.begin_nested():
+                        history_manager = QueryHistoryManager(app_db)
+                        history_manager.record_query(
+                            user_id=current_user.id,
+                            query=request.query,
+                            duration_ms=result.execution_time_ms,
+                            connection_id=request.connection_id
+                        )
                 except Exception as e:
                     print(f"HISTORY LOG FAILED: {str(e)}")
             
@@ -154,6 +179,93 @@ async def execute_sql(
         }
 
 
+@router.post("/execute/stream")
+async def execute_sql_stream(
+    request: SQLRequest = Body(...),
+    current_user: User = Depends(get_current_user),
+    app_db: Session = Depends(get_app_db)
+):
+    """
+    Execute a SELECT on the User Operational Database and stream the rows.
+    
+    Unlike /execute no LIMIT is added and the result is never buffered: rows
+    are read off a server-side cursor and sent as NDJSON as they arrive.
+    Audit and query history are recorded like /execute, before streaming
+    starts.
+    """
+    if not current_user.has_permission("sql:execute"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="SQL execution permission required"
+        )
+    
+    if not request.query.strip().upper().startswith('SELECT'):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only SELECT queries can be streamed"
+        )
+    
+    # The User DB connection outlives this handler; the response closes it
+    stack = ExitStack()
+    start_time = time.time()
+    try:
+        user_conn = stack.enter_context(user_db_manager.get_connection(app_db, request.connection_id))
+        result = user_conn.execution_options(
+            stream_results=True, yield_per=STREAM_CHUNK_SIZE
+        ).execute(text(request.query))
+    except ValueError as e:
+        stack.close()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
+    except Exception as e:
+        stack.close()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Query failed: {str(e)}"
+        )
+    execution_time_ms = int((time.time() - start_time) * 1000)
+    
+    # Audit log and history to App DB (the session is gone once streaming
+    # starts); best effort, each in its own SAVEPOINT as in /execute
+    try:
+        with app_db.begin_nested():
+            auditor = AuditLogger(app_db)
+            auditor.log_query(
+                user=current_user,
+                query=request.query,
+                duration_ms=execution_time_ms,
+                success=True,
+                connection_id=request.connection_id
+            )
+    except Exception as e:
+        logger.warning("audit_log_failed", error=str(e), connection_id=request.connection_id)
+    
+    try:
+        with app_db.begin_nested():
+            QueryHistoryManager(app_db).record_query(
+                user_id=current_user.id,
+                query=request.query,
+                duration_ms=execution_time_ms,
+                connection_id=request.connection_id
+            )
+    except Exception as e:
+        logger.warning("query_history_failed", error=str(e), connection_id=request.connection_id)
+    
+    def body() -> Iterator[str]:
+        with stack:
+            yield from stream_user_result(result)
+    
+    # The background task closes the connection even if the client goes
+    # away before the body is ever iterated; closing twice is a no-op
+    return StreamingResponse(
+        body(),
+        media_type="application/x-ndjson",
+        background=BackgroundTask(stack.close)
+    )
+
+
 @router.post("/explain", response_model=QueryExplainResult)
 async def explain_query(
     request: SQLRequest = Body(...),
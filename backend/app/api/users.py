@@ -1,70 +1,208 @@
 """
 Users API Routes
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy import select, bindparam, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload, make_transient_to_detached
+from typing import Any, Dict, List, Optional
+import hashlib
+import threading
+import time
 
 from app.database import get_db
 from app.schemas import UserResponse, UserUpdate, RoleResponse, RoleCreate
-from app.models import User, Role
-from app.core.rbac import get_current_user, get_current_superuser
+from app.models import User, Role, Permission
+from app.models.user import user_roles, role_permissions
+from app.core.rbac import get_current_user, get_current_superuser, permission_cache
 
 router = APIRouter()
 
+# UserResponse serializes roles and their permissions; load both with one
+# IN query each instead of lazily per user/role.
+_USER_RESPONSE_LOAD = selectinload(User.roles).selectinload(Role.permissions)
 
-@router.get("/", response_model=List[UserResponse])
-async def list_users(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, le=1000),
-    current_user: User = Depends(get_current_superuser),
-    db: Session = Depends(get_db)
-):
-    """List all users (admin only)."""
-    users = db.query(User).offset(skip).limit(limit).all()
-    return users
+# Hot statements are built once with bound parameters so every request reuses
+# the same cache key in SQLAlchemy's compiled-statement cache.
+_STMT_LIST_USERS = (
+    select(
+        User.id, User.email, User.username, User.full_name, User.is_active,
+        User.is_superuser, User.created_at, User.updated_at, User.last_login
+    )
+    .order_by(User.id)
+    .offset(bindparam("skip"))
+    .limit(bindparam("limit"))
+)
+_STMT_ROLES_FOR_USERS = (
+    select(
+        user_roles.c.user_id, Role.id, Role.name, Role.description,
+        Role.is_system, Role.created_at
+    )
+    .join(Role, Role.id == user_roles.c.role_id)
+    .where(user_roles.c.user_id.in_(bindparam("user_ids", expanding=True)))
+    .order_by(user_roles.c.user_id, Role.id)
+)
+_STMT_PERMISSIONS_FOR_ROLES = (
+    select(
+        role_permissions.c.role_id, Permission.id, Permission.name,
+        Permission.description, Permission.resource, Permission.action
+    )
+    .join(Permission, Permission.id == role_permissions.c.permission_id)
+    .where(role_permissions.c.role_id.in_(bindparam("role_ids", expanding=True)))
+    .order_by(role_permissions.c.role_id, Permission.id)
+)
+_STMT_LIST_ROLES = select(Role).options(selectinload(Role.permissions)).order_by(Role.id)
+# Roles are only ever added (and gain permissions at RBAC init), so these
+# counters change whenever the list_roles payload does.
+_STMT_ROLES_FINGERPRINT = select(
+    func.count(Role.id),
+    func.max(Role.id),
+    func.max(Role.created_at),
+    select(func.count()).select_from(role_permissions).scalar_subquery()
+)
+_STMT_ROLE_BY_NAME = select(Role.id).where(Role.name == bindparam("name"))
+_STMT_ROLE_SNAPSHOT = select(Role.id, Role.name, Role.description, Role.is_system, Role.created_at)
 
+# Roles are admin-managed and rarely change, so keep a per-process snapshot of
+# their column values for resolving role_ids without a round-trip.
+_ROLE_CACHE_TTL_SECONDS = 60
+_role_cache: Dict[int, Dict[str, Any]] = {}
+_role_cache_ts: float = 0.0
+# Serializes reloads so concurrent requests don't each rebuild the snapshot
+_role_cache_lock = threading.Lock()
 
-@router.get("/{user_id}", response_model=UserResponse)
-async def get_user(
+
+def _get_role_cache(db: Session, force: bool = False) -> Dict[int, Dict[str, Any]]:
+    """Return the role snapshot, reloading it when cold, expired or forced."""
+    global _role_cache, _role_cache_ts
+    with _role_cache_lock:
+        if force or not _role_cache or time.monotonic() - _role_cache_ts > _ROLE_CACHE_TTL_SECONDS:
+            rows = db.execute(_STMT_ROLE_SNAPSHOT).all()
+            _role_cache = {row.id: row._asdict() for row in rows}
+            _role_cache_ts = time.monotonic()
+        return _role_cache
+
+
+def _invalidate_role_cache() -> None:
+    """Drop the role snapshot so the next lookup reloads it."""
+    global _role_cache, _role_cache_ts
+    with _role_cache_lock:
+        _role_cache = {}
+        _role_cache_ts = 0.0
+
+
+def _resolve_roles(db: Session, role_ids: List[int]) -> List[Role]:
+    """Attach cached roles to the session without emitting a SELECT.
+
+    An ID missing from the snapshot reloads it once, so roles created by
+    another process are found; IDs still unknown are skipped, matching the
+    previous ``IN`` query semantics.
+    """
+    cache = _get_role_cache(db)
+    if any(role_id not in cache for role_id in role_ids):
+        cache = _get_role_cache(db, force=True)
+    roles = []
+    for role_id in dict.fromkeys(role_ids):
+        data = cache.get(role_id)
+        if data is None:
+            continue
+        role = Role(**data)
+        make_transient_to_detached(role)
+        roles.append(db.merge(role, load=False))
+    return roles
+
+
+def _serialize_user_rows(db: Session, user_rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Build UserResponse payloads from plain column rows.
+    
+    Roles and their permissions are fetched with one query each, so no ORM
+    instances are constructed for list responses.
+    """
+    if not user_rows:
+        return []
+    
+    roles_by_user: Dict[int, List[Dict[str, Any]]] = {}
+    roles_by_id: Dict[int, Dict[str, Any]] = {}
+    user_ids = [row["id"] for row in user_rows]
+    for row in db.execute(_STMT_ROLES_FOR_USERS, {"user_ids": user_ids}).mappings():
+        role = roles_by_id.get(row["id"])
+        if role is None:
+            role = {
+                "id": row["id"],
+                "name": row["name"],
+                "description": row["description"],
+                "is_system": row["is_system"],
+                "created_at": row["created_at"],
+                "permissions": []
+            }
+            roles_by_id[row["id"]] = role
+        roles_by_user.setdefault(row["user_id"], []).append(role)
+    
+    if roles_by_id:
+        permission_rows = db.execute(
+            _STMT_PERMISSIONS_FOR_ROLES, {"role_ids": list(roles_by_id)}
+        ).mappings()
+        for row in permission_rows:
+            permission = dict(row)
+            roles_by_id[permission.pop("role_id")]["permissions"].append(permission)
+    
+    return [
+        {**row, "roles": roles_by_user.get(row["id"], [])}
+        for row in user_rows
+    ]
+
+
+def get_user_or_404(
     user_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
-):
-    """Get user by ID."""
-    # Users can view their own profile; admins can view anyone
+) -> User:
+    """
+    Dependency resolving the ``user_id`` path parameter to a User.
+    
+    Users may only access themselves, admins anyone. Authorization is
+    checked before the lookup, so callers without rights get 403 whether
+    or not the id exists and can't probe for user ids.
+    """
     if user_id != current_user.id and not current_user.is_superuser:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to view this user"
+            detail="Not authorized to access this user"
         )
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.get(User, user_id, options=[_USER_RESPONSE_LOAD])
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    
+    return user
+
+
+@router.get("/", response_model=List[UserResponse])
+async def list_users(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, le=1000),
+    current_user: User = Depends(get_current_superuser),
+    db: Session = Depends(get_db)
+):
+    """List all users (admin only)."""
+    rows = db.execute(_STMT_LIST_USERS, {"skip": skip, "limit": limit}).mappings().all()
+    return _serialize_user_rows(db, rows)
+
+
+@router.get("/{user_id}", response_model=UserResponse)
+async def get_user(user: User = Depends(get_user_or_404)):
+    """Get user by ID (self or admin, see get_user_or_404)."""
     return user
 
 
 @router.put("/{user_id}", response_model=UserResponse)
 async def update_user(
-    user_id: int,
     user_update: UserUpdate,
     current_user: User = Depends(get_current_user),
+    user: User = Depends(get_user_or_404),
     db: Session = Depends(get_db)
 ):
-    """Update user."""
-    # Users can update themselves; admins can update anyone
-    if user_id != current_user.id and not current_user.is_superuser:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to update this user"
-        )
-    
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    
+    """Update user (self or admin, see get_user_or_404)."""
     # Update fields
     if user_update.email:
         user.email = user_update.email
@@ -78,45 +216,70 @@ async def update_user(
         if user_update.is_active is not None:
             user.is_active = user_update.is_active
         if user_update.role_ids:
-            roles = db.query(Role).filter(Role.id.in_(user_update.role_ids)).all()
-            user.roles = roles
+            user.roles = _resolve_roles(db, user_update.role_ids)
     
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # A cached role was deleted since the snapshot was taken
+        db.rollback()
+        _invalidate_role_cache()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="One or more roles no longer exist"
+        )
     db.refresh(user)
+    permission_cache.invalidate(user.id)
     
     return user
 
 
 @router.delete("/{user_id}")
 async def delete_user(
-    user_id: int,
     current_user: User = Depends(get_current_superuser),
+    user: User = Depends(get_user_or_404),
     db: Session = Depends(get_db)
 ):
     """Delete user (admin only)."""
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    
     if user.id == current_user.id:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot delete yourself"
         )
     
+    user_id = user.id
     db.delete(user)
     db.commit()
+    permission_cache.invalidate(user_id)
     
     return {"message": "User deleted successfully"}
 
 
 @router.get("/roles/", response_model=List[RoleResponse])
 async def list_roles(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """List all roles."""
-    roles = db.query(Role).all()
+    """
+    List all roles.
+    
+    Supports conditional requests: the ETag is derived from a single
+    aggregate query, and a matching If-None-Match returns 304 without
+    loading or serializing the roles.
+    """
+    fingerprint = db.execute(_STMT_ROLES_FINGERPRINT).one()
+    etag = '"%s"' % hashlib.blake2b(repr(tuple(fingerprint)).encode(), digest_size=8).hexdigest()
+    
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag in candidates or "*" in candidates:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    
+    response.headers["ETag"] = etag
+    roles = db.scalars(_STMT_LIST_ROLES).all()
     return roles
 
 
@@ -127,7 +290,7 @@ async def create_role(
     db: Session = Depends(get_db)
 ):
     """Create a new role (admin only)."""
-    existing = db.query(Role).filter(Role.name == role_data.name).first()
+    existing = db.execute(_STMT_ROLE_BY_NAME, {"name": role_data.name}).first()
     if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -142,5 +305,6 @@ async def create_role(
     db.add(role)
     db.commit()
     db.refresh(role)
+    _invalidate_role_cache()
     
     return role
@@ -2,6 +2,7 @@
 Capability Detector - Detects database capabilities and features
 """
 from typing import Dict, Any
+from dataclasses import asdict
 import logging
 from sqlalchemy.orm import Session
 
@@ -21,6 +22,16 @@ class CapabilityDetector:
     and other capabilities for optimal query generation and UI features.
     """
     
+    # Feature name -> key in the stored capabilities dict
+    _FEATURE_MAP = {
+        'transactions': 'supports_transactions',
+        'stored_procedures': 'supports_stored_procedures',
+        'views': 'supports_views',
+        'materialized_views': 'supports_materialized_views',
+        'json': 'supports_json',
+        'full_text_search': 'supports_full_text_search'
+    }
+    
     def detect_and_save(self, db: Session, connection: ConnectionProfile) -> DatabaseCapabilities:
         """
         Detect capabilities and save to connection profile.
@@ -56,18 +67,7 @@ class CapabilityDetector:
     
     def _capabilities_to_dict(self, capabilities: DatabaseCapabilities) -> Dict[str, Any]:
         """Convert DatabaseCapabilities to dict for JSON storage."""
-        return {
-            "version": capabilities.version,
-            "supports_transactions": capabilities.supports_transactions,
-            "supports_stored_procedures": capabilities.supports_stored_procedures,
-            "supports_views": capabilities.supports_views,
-            "supports_materialized_views": capabilities.supports_materialized_views,
-            "supports_json": capabilities.supports_json,
-            "supports_full_text_search": capabilities.supports_full_text_search,
-            "max_connections": capabilities.max_connections,
-            "features": capabilities.features,
-            "extensions": capabilities.extensions
-        }
+        return asdict(capabilities)
     
     def get_cached_capabilities(self, connection: ConnectionProfile) -> Dict[str, Any]:
         """
@@ -92,19 +92,9 @@ class CapabilityDetector:
         Returns:
             True if feature is supported
         """
-        capabilities = self.get_cached_capabilities(connection)
-        feature_map = {
-            'transactions': 'supports_transactions',
-            'stored_procedures': 'supports_stored_procedures',
-            'views': 'supports_views',
-            'materialized_views': 'supports_materialized_views',
-            'json': 'supports_json',
-            'full_text_search': 'supports_full_text_search'
-        }
-        
-        capability_key = feature_map.get(feature)
+        capability_key = self._FEATURE_MAP.get(feature)
         if capability_key:
-            return capabilities.get(capability_key, False)
+            return self.get_cached_capabilities(connection).get(capability_key, False)
         
         return False
 
@@ -1,12 +1,15 @@
 """
 Connection Manager - Manages multiple database connections
 """
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
+from concurrent.futures import ThreadPoolExecutor
 import logging
+import threading
 
+from app.config import settings
 from app.models.connection import ConnectionProfile, ConnectionType
-from app.core.crypto import decrypt_password, decrypt_value
+from app.core.crypto import decrypt_value
 from app.connections.connectors.base_connector import BaseConnector, HealthCheckResult
 from app.connections.connectors.postgres_connector import PostgreSQLConnector
 from app.connections.connectors.mysql_connector import MySQLConnector
@@ -24,10 +27,54 @@ class ConnectionManager:
     automatic pooling, health monitoring, and lifecycle management.
     """
     
+    # Upper bound on threads used to disconnect connectors in parallel
+    MAX_CLOSE_WORKERS = 16
+    
     def __init__(self):
         """Initialize connection manager."""
         self._connectors: Dict[int, BaseConnector] = {}
-        self._connection_profiles: Dict[int, ConnectionProfile] = {}
+        # connection_id -> (name, db_type); avoids pinning ORM profiles from closed sessions
+        self._profile_meta: Dict[int, Tuple[str, str]] = {}
+        self._creation_locks: Dict[int, threading.Lock] = {}
+        # connection_id -> (ciphertext, plaintext); a rotated secret changes
+        # the ciphertext, which invalidates the entry on the next lookup.
+        self._password_cache: Dict[int, Tuple[str, Optional[str]]] = {}
+        self._connection_string_cache: Dict[int, Tuple[str, Optional[str]]] = {}
+    
+    @staticmethod
+    def _decrypt_cached(
+        cache: Dict[int, Tuple[str, Optional[str]]],
+        connection_id: Optional[int],
+        encrypted_value: Optional[str]
+    ) -> Optional[str]:
+        """Decrypt a profile secret, reusing the plaintext while the ciphertext is unchanged."""
+        if not encrypted_value:
+            return None
+        
+        cached = cache.get(connection_id)
+        if cached is not None and cached[0] == encrypted_value:
+            return cached[1]
+        
+        decrypted = decrypt_value(encrypted_value)
+        if connection_id is not None:
+            cache[connection_id] = (encrypted_value, decrypted)
+        return decrypted
+    
+    def _decrypt_password(self, connection_profile: ConnectionProfile) -> Optional[str]:
+        """Get the decrypted password for a profile."""
+        return self._decrypt_cached(
+            self._password_cache,
+            connection_profile.id,
+            connection_profile.encrypted_password
+        )
+    
+    def _decrypt_connection_string(self, connection_profile: ConnectionProfile) -> Optional[str]:
+        """Get the decrypted full connection URI for a profile, if one is stored."""
+        return self._decrypt_cached(
+            self._connection_string_cache,
+            connection_profile.id,
+            getattr(connection_profile, 'encrypted_connection_string', None)
+        )
     
     def get_connector(self, connection_profile: ConnectionProfile, decrypted_password: str = None) -> BaseConnector:
         """
@@ -46,57 +93,82 @@ class ConnectionManager:
         """
         connection_id = connection_profile.id
         
-        # Return existing connector if available
-        if connection_id in self._connectors:
-            connector = self._connectors[connection_id]
-            if connector.is_connected():
-                return connector
-            else:
-                # Reconnect if disconnected
-                connector.connect()
-                return connector
+        # Hot path: reuse the existing connector
+        connector = self._connectors.get(connection_id)
+        if connector is not None:
+            return self._ensure_connected(connector)
         
-        # Create new connector
-        if not decrypted_password:
-            decrypted_password = decrypt_password(connection_profile.encrypted_password)
+        # Cold path: serialize creation per connection so concurrent misses
+        # don't each open (and leak) a connector
+        with self._creation_locks.setdefault(connection_id, threading.Lock()):
+            connector = self._connectors.get(connection_id)
+            if connector is not None:
+                return self._ensure_connected(connector)
             
-        decrypted_connection_string = None
-        if hasattr(connection_profile, 'encrypted_connection_string') and connection_profile.encrypted_connection_string:
-            decrypted_connection_string = decrypt_value(connection_profile.encrypted_connection_string)
-        
-        # Get connection string (prioritizing the full URI if present)
-        connection_string = connection_profile.get_connection_string(decrypted_password, decrypted_connection_string)
-        
-        # Select connector based on database type
-        connector_class = self._get_connector_class(connection_profile.db_type)
+            if not decrypted_password:
+                decrypted_password = self._decrypt_password(connection_profile)
+                
+            decrypted_connection_string = self._decrypt_connection_string(connection_profile)
+            
+            # Get connection string (prioritizing the full URI if present)
+            connection_string = connection_profile.get_connection_string(decrypted_password, decrypted_connection_string)
+            
+            # Select connector based on database type
+            connector_class = self._get_connector_class(connection_profile.db_type)
+            
+            connector = connector_class(
+                connection_string=connection_string,
+                pool_size=connection_profile.pool_size,
+                timeout=connection_profile.timeout_seconds,
+                **self._pool_options(connection_profile)
+            )
+            
+            # Connect
+            try:
+                connector.connect()
+                self._connectors[connection_id] = connector
+                self._profile_meta[connection_id] = (connection_profile.name, connection_profile.db_type)
+                logger.info(f"Connected to database: {connection_profile.name} (ID: {connection_id})")
+                return connector
+            except Exception as e:
+                logger.error(f"Failed to connect to {connection_profile.name}: {str(e)}")
+                raise
+    
+    @staticmethod
+    def _pool_options(connection_profile: ConnectionProfile) -> Dict[str, Any]:
+        """
+        Explicit pool limits for a profile's connector.
         
-        connector = connector_class(
-            connection_string=connection_string,
-            pool_size=connection_profile.pool_size,
-            timeout=connection_profile.timeout_seconds
-        )
+        The profile's max_connections caps pool_size + overflow; profiles
+        without a usable cap fall back to the configured overflow.
+        """
+        max_overflow = settings.CONNECTOR_MAX_OVERFLOW
+        if connection_profile.max_connections and connection_profile.pool_size:
+            max_overflow = max(connection_profile.max_connections - connection_profile.pool_size, 0)
         
-        # Connect
-        try:
+        return {
+            "max_overflow": max_overflow,
+            "pool_timeout": settings.CONNECTOR_POOL_TIMEOUT,
+            "pool_pre_ping": settings.CONNECTOR_POOL_PRE_PING,
+        }
+    
+    @staticmethod
+    def _ensure_connected(connector: BaseConnector) -> BaseConnector:
+        """Reconnect a cached connector if it was disconnected."""
+        if not connector.is_connected():
             connector.connect()
-            self._connectors[connection_id] = connector
-            self._connection_profiles[connection_id] = connection_profile
-            logger.info(f"Connected to database: {connection_profile.name} (ID: {connection_id})")
-            return connector
-        except Exception as e:
-            logger.error(f"Failed to connect to {connection_profile.name}: {str(e)}")
-            raise
+        return connector
 
     def create_temp_connector(self, connection_profile: ConnectionProfile, decrypted_password: str = None, decrypted_connection_string: str = None) -> BaseConnector:
         """
         Create a temporary connector without caching.
         Use for testing connections or discovering databases.
         """
-        if not decrypted_password and connection_profile.encrypted_password:
-             decrypted_password = decrypt_password(connection_profile.encrypted_password)
+        if not decrypted_password:
+            decrypted_password = self._decrypt_password(connection_profile)
              
-        if not decrypted_connection_string and hasattr(connection_profile, 'encrypted_connection_string') and connection_profile.encrypted_connection_string:
-             decrypted_connection_string = decrypt_value(connection_profile.encrypted_connection_string)
+        if not decrypted_connection_string:
+            decrypted_connection_string = self._decrypt_connection_string(connection_profile)
             
         connection_string = connection_profile.get_connection_string(decrypted_password, decrypted_connection_string)
         
@@ -105,7 +177,8 @@ class ConnectionManager:
         connector = connector_class(
             connection_string=connection_string,
             pool_size=1, # Minimal pool for temp operations
-            timeout=10   # Shorter timeout
+            timeout=10,  # Shorter timeout
+            pool_timeout=10
         )
         
         connector.connect()
@@ -132,20 +205,31 @@ class ConnectionManager:
         """
         Close and remove a connection.
         
+        Also purges the cached decrypted credentials for the connection.
+        
         Args:
             connection_id: Connection profile ID
         """
-        if connection_id in self._connectors:
-            connector = self._connectors[connection_id]
+        self._password_cache.pop(connection_id, None)
+        self._connection_string_cache.pop(connection_id, None)
+        connector = self._connectors.pop(connection_id, None)
+        if connector is not None:
+            self._profile_meta.pop(connection_id, None)
             connector.disconnect()
-            del self._connectors[connection_id]
-            del self._connection_profiles[connection_id]
             logger.info(f"Closed connection ID: {connection_id}")
     
+    def _close_connections(self, connection_ids: List[int]) -> None:
+        """Close several connections concurrently; each disconnect waits on its own server."""
+        if not connection_ids:
+            return
+        
+        max_workers = min(len(connection_ids), self.MAX_CLOSE_WORKERS)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(self.close_connection, connection_ids))
+    
     def close_all_connections(self) -> None:
         """Close all active connections."""
-        for connection_id in list(self._connectors.keys()):
-            self.close_connection(connection_id)
+        self._close_connections(list(self._connectors.keys()))
         logger.info("Closed all connections")
     
     def health_check(self, connection_id: int) -> Optional[HealthCheckResult]:
@@ -172,8 +256,8 @@ class ConnectionManager:
             Dict mapping connection_id to connection name
         """
         return {
-            conn_id: profile.name
-            for conn_id, profile in self._connection_profiles.items()
+            conn_id: name
+            for conn_id, (name, _db_type) in self._profile_meta.items()
         }
     
     def cleanup_idle_connections(self) -> int:
@@ -183,12 +267,14 @@ class ConnectionManager:
         Returns:
             Number of connections cleaned up
         """
-        cleaned = 0
-        for connection_id in list(self._connectors.keys()):
-            connector = self._connectors[connection_id]
-            if not connector.is_connected():
-                self.close_connection(connection_id)
-                cleaned += 1
+        # is_connected() is a local check, so only the disconnects fan out
+        idle_ids = [
+            connection_id
+            for connection_id, connector in list(self._connectors.items())
+            if not connector.is_connected()
+        ]
+        self._close_connections(idle_ids)
+        cleaned = len(idle_ids)
         
         if cleaned > 0:
             logger.info(f"Cleaned up {cleaned} idle connections")
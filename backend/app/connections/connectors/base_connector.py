@@ -3,10 +3,129 @@ Base Connector Interface for Multi-Database Support
 All database connectors must implement this interface
 """
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache, wraps
 import enum
+import re
+import time
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import CursorResult, Engine
+from sqlalchemy.sql.elements import TextClause
+from sqlalchemy.util import immutabledict
+
+# Distinct SQL strings kept compiled, both as TextClauses and in each
+# engine's compiled cache (passed as create_engine(query_cache_size=...))
+STATEMENT_CACHE_SIZE = 512
+
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def cached_text(sql: str) -> TextClause:
+    """
+    Get a reusable TextClause for a SQL string.
+    
+    Saves re-parsing bind parameters for statements that SQL connectors
+    execute repeatedly; TextClause objects are safe to share.
+    """
+    return text(sql)
+
+
+# Execution options for SELECTs: server-side cursor, fetched in chunks
+# (one immutable mapping shared by every call)
+STREAM_EXECUTION_OPTIONS = immutabledict({"stream_results": True, "yield_per": 1000})
+
+
+def is_select(sql: str) -> bool:
+    """
+    Check whether a SQL string is a plain SELECT.
+    
+    Server-side cursors only accept queries, so streaming is restricted to
+    statements that start with SELECT.
+    """
+    return sql.lstrip()[:6].upper() == "SELECT"
+
+
+# Statements that change the catalog and so invalidate cached metadata
+_DDL_RE = re.compile(r"\s*(CREATE|ALTER|DROP|RENAME)\b", re.IGNORECASE)
+
+
+def is_ddl(sql: str) -> bool:
+    """Check whether a SQL string is a schema-changing (DDL) statement."""
+    return _DDL_RE.match(sql) is not None
+
+
+# Inspector calls that together describe a table, see reflect_table()
+TABLE_REFLECTION_CALLS = ("get_columns", "get_pk_constraint", "get_foreign_keys", "get_indexes")
+
+
+def reflect_table(engine: Engine, table: str, schema: str) -> Dict[str, Any]:
+    """
+    Run the inspector calls for a table concurrently.
+    
+    Each call checks out its own pooled connection, so the round trips
+    overlap instead of running back to back.
+    
+    Returns:
+        Dict mapping each name in TABLE_REFLECTION_CALLS to its result
+    """
+    def reflect(call: str) -> Any:
+        with engine.connect() as connection:
+            return getattr(inspect(connection), call)(table, schema=schema)
+    
+    with ThreadPoolExecutor(max_workers=len(TABLE_REFLECTION_CALLS)) as executor:
+        return dict(zip(TABLE_REFLECTION_CALLS, executor.map(reflect, TABLE_REFLECTION_CALLS)))
+
+
+def fetch_query_result(result: CursorResult) -> "QueryResult":
+    """
+    Read an executed statement into a successful QueryResult.
+    
+    The caller fills in execution_time_ms once fetching is done.
+    """
+    query_result = QueryResult(
+        status=QueryResultStatus.SUCCESS,
+        rows=[],
+        columns=[],
+        row_count=0,
+        execution_time_ms=0
+    )
+    if not result.returns_rows:
+        return query_result
+    
+    keys = tuple(result.keys())
+    query_result.columns = list(keys)
+    query_result.rows = [dict(zip(keys, row)) for row in result]
+    query_result.row_count = len(query_result.rows)
+    return query_result
+
+
+def cached_metadata(method):
+    """
+    Memoize a connector metadata method for METADATA_CACHE_TTL_SECONDS
+    (indefinitely when that is None).
+    
+    Results are cached per connector instance and keyed on the method name
+    and arguments; BaseConnector.invalidate_metadata() drops them.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        cached = self._metadata_cache.get(key)
+        now = time.monotonic()
+        ttl = self.METADATA_CACHE_TTL_SECONDS
+        if cached is not None and (ttl is None or now - cached[0] < ttl):
+            return cached[1]
+        if cached is not None:
+            # Expired: make sure the reload isn't served from the inspector
+            self._clear_reflection_cache()
+        value = method(self, *args, **kwargs)
+        self._metadata_cache[key] = (now, value)
+        return value
+    return wrapper
 
 
 class QueryResultStatus(str, enum.Enum):
@@ -16,7 +135,7 @@ class QueryResultStatus(str, enum.Enum):
     TIMEOUT = "timeout"
 
 
-@dataclass
+@dataclass(slots=True)
 class TableInfo:
     """Table metadata."""
     name: str
@@ -94,7 +213,19 @@ class BaseConnector(ABC):
     All database-specific connectors must implement this interface.
     """
     
-    def __init__(self, connection_string: str, pool_size: int = 5, timeout: int = 30):
+    # How long cached schema/table metadata is reused; None keeps it until
+    # invalidate_metadata(), for deployments whose schemas don't change
+    METADATA_CACHE_TTL_SECONDS: Optional[int] = 60
+    
+    def __init__(
+        self,
+        connection_string: str,
+        pool_size: int = 5,
+        timeout: int = 30,
+        max_overflow: int = 10,
+        pool_timeout: int = 30,
+        pool_pre_ping: bool = True
+    ):
         """
         Initialize connector.
         
@@ -102,12 +233,59 @@ class BaseConnector(ABC):
             connection_string: Database connection string
             pool_size: Connection pool size
             timeout: Connection timeout in seconds
+            max_overflow: Connections allowed beyond pool_size under load
+            pool_timeout: Seconds to wait for a pooled connection before failing
+            pool_pre_ping: Validate pooled connections before handing them out
         """
         self.connection_string = connection_string
         self.pool_size = pool_size
         self.timeout = timeout
+        self.max_overflow = max_overflow
+        self.pool_timeout = pool_timeout
+        self.pool_pre_ping = pool_pre_ping
         self._connection = None
         self._pool = None
+        # SQLAlchemy Inspector, for connectors that reflect through one
+        self._inspector = None
+        # Set between start_transaction() and commit()/rollback()
+        self._in_transaction = False
+        # Metadata caches, reset by invalidate_metadata()
+        self._metadata_cache: Dict[Tuple, Tuple[float, Any]] = {}
+        self._capabilities: Optional[DatabaseCapabilities] = None
+    
+    @contextmanager
+    def _query_connection(self) -> Iterator[Any]:
+        """
+        Get the connection a single query should run on.
+        
+        Inside an explicit transaction that is the connector's own
+        connection. Otherwise a connection is checked out of the engine pool
+        for the duration of the query and committed on success, so
+        concurrent callers don't serialize on one DBAPI connection.
+        """
+        if self._in_transaction:
+            yield self._connection
+        else:
+            with self._engine.begin() as connection:
+                yield connection
+    
+    def invalidate_metadata(self, include_capabilities: bool = False) -> None:
+        """
+        Drop cached metadata so the next lookup hits the database.
+        
+        Args:
+            include_capabilities: Also forget detected capabilities, which
+                only change when the server itself does (e.g. on reconnect)
+        """
+        self._metadata_cache.clear()
+        self._clear_reflection_cache()
+        if include_capabilities:
+            self._capabilities = None
+    
+    def _clear_reflection_cache(self) -> None:
+        """Drop the inspector's own reflection cache, which never expires."""
+        if self._inspector is not None:
+            self._inspector.clear_cache()
     
     @abstractmethod
     def connect(self) -> None:
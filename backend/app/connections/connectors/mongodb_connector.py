@@ -2,10 +2,15 @@
 MongoDB Connector
 Implements BaseConnector for MongoDB databases
 """
+from bson import ObjectId
 from pymongo import MongoClient
+from pymongo.collection import Collection
 from pymongo.errors import ConnectionFailure, OperationFailure
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Callable, Iterable, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import json
+import re
 import time
 from datetime import datetime
 
@@ -20,35 +25,143 @@ from app.connections.connectors.base_connector import (
     DatabaseCapabilities
 )
 
+# mongodb:// and mongodb+srv:// URIs; credentials and options are optional
+_MONGO_URI_RE = re.compile(
+    r"^(?P<scheme>mongodb(?:\+srv)?)://"
+    r"(?:[^:@\s]*(?::[^@\s]*)?@)?"
+    r"(?P<host>[^/?\s]+)"
+    r"(?:/(?P<db>[^?\s]*))?"
+    r"(?:\?.*)?$"
+)
+
+# Values that are already JSON-compatible. They make up the bulk of document
+# fields, so an exact type check on them short-circuits before isinstance().
+_JSON_SCALAR_TYPES = frozenset((str, int, float, bool, type(None)))
+
+
+def _serialize_value(value: Any) -> Any:
+    """
+    Convert a BSON value to a JSON-compatible one.
+    
+    ObjectIds become strings and datetimes ISO strings. Dicts and lists are
+    updated in place rather than copied, so only converted values allocate.
+    """
+    if type(value) in _JSON_SCALAR_TYPES:
+        return value
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if type(item) not in _JSON_SCALAR_TYPES:
+                value[key] = _serialize_value(item)
+        return value
+    if isinstance(value, list):
+        for index, item in enumerate(value):
+            if type(item) not in _JSON_SCALAR_TYPES:
+                value[index] = _serialize_value(item)
+        return value
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+@lru_cache(maxsize=256)
+def _document_serializer(shape: Tuple[Tuple[str, type], ...]) -> Callable[[Dict], Dict]:
+    """
+    Generate a serializer specialized for one document shape.
+    
+    shape holds the (field, type) pairs of a sample document. Each field gets
+    straight-line code that tests for the type seen in the sample first, so
+    documents of that shape skip the generic per-value dispatch. Documents
+    with a different set of fields fall back to _serialize_value().
+    """
+    lines = [
+        "def serialize(doc):",
+        "    if doc.keys() != fields:",
+        "        return _serialize_value(doc)",
+    ]
+    for field, field_type in shape:
+        key = repr(field)
+        lines.append(f"    v = doc[{key}]")
+        if field_type is ObjectId:
+            lines.append(f"    if type(v) is ObjectId: doc[{key}] = str(v)")
+            lines.append(f"    elif type(v) not in scalar_types: doc[{key}] = _serialize_value(v)")
+        elif field_type is datetime:
+            lines.append(f"    if type(v) is datetime: doc[{key}] = v.isoformat()")
+            lines.append(f"    elif type(v) not in scalar_types: doc[{key}] = _serialize_value(v)")
+        else:
+            lines.append(f"    if type(v) not in scalar_types: doc[{key}] = _serialize_value(v)")
+    lines.append("    return doc")
+    
+    namespace = {
+        "fields": {field for field, _ in shape},
+        "scalar_types": _JSON_SCALAR_TYPES,
+        "ObjectId": ObjectId,
+        "datetime": datetime,
+        "_serialize_value": _serialize_value,
+    }
+    exec(compile("\n".join(lines), "<mongodb document serializer>", "exec"), namespace)
+    return namespace["serialize"]
+
 
 class MongoDBConnector(BaseConnector):
     """MongoDB connector implementation"""
     
-    def __init__(self, connection_string: str, pool_size: int = 5, timeout: int = 30):
-        super().__init__(connection_string, pool_size, timeout)
+    # Idle sockets above minPoolSize are closed after this long
+    MAX_IDLE_TIME_MS = 60000
+    # Upper bound on concurrent count/$collStats calls in list_tables
+    STATS_MAX_WORKERS = 16
+    # How long list_collection_names() results are reused
+    COLLECTION_NAMES_TTL_SECONDS = 30
+    # How long inferred collection schemas are reused
+    SCHEMA_CACHE_TTL_SECONDS = 300
+    # Documents sampled server-side when inferring a collection schema
+    SCHEMA_SAMPLE_SIZE = 100
+    # Documents fetched per round-trip when streaming find/aggregate cursors
+    CURSOR_BATCH_SIZE = 1000
+    # Monitor heartbeats younger than this let test_connection skip a command
+    HEARTBEAT_FRESHNESS_SECONDS = 15
+    
+    def __init__(
+        self,
+        connection_string: str,
+        pool_size: int = 100,
+        timeout: int = 30,
+        min_pool_size: Optional[int] = None,
+        **pool_options
+    ):
+        super().__init__(connection_string, pool_size, timeout, **pool_options)
+        # Keep a share of the pool pre-warmed so bursts don't pay connect latency
+        if min_pool_size is None:
+            min_pool_size = min(self.pool_size, max(self.pool_size // 4, 5))
+        self.min_pool_size = min_pool_size
         self.client: Optional[MongoClient] = None
         self.db = None
         self._db_name = None
         
+        # Per-connection caches, reset on connect/disconnect
+        self._collections: Dict[str, Collection] = {}
+        self._schema_cache: Dict[Tuple[str, str], Tuple[float, TableSchema]] = {}
+        self._collection_names: Optional[Tuple[float, List[str]]] = None
+        
         # Extract database name from connection string
-        if '/' in connection_string:
-            parts = connection_string.split('/')
-            if len(parts) > 0:
-                # Get the part after the last slash as potential db name
-                last_part = parts[-1] 
-                # Remove query parameters
-                db_name = last_part.split('?')[0]
-                if db_name:
-                    self._db_name = db_name
+        match = _MONGO_URI_RE.match(connection_string)
+        if match and match.group('db'):
+            self._db_name = match.group('db')
     
     def connect(self):
         """Establish MongoDB connection"""
         try:
+            # PyMongo grows the pool on demand, so pool_size + max_overflow is
+            # the same ceiling the SQL connectors' QueuePool enforces
             self.client = MongoClient(
                 self.connection_string,
                 serverSelectionTimeoutMS=self.timeout * 1000,
                 connectTimeoutMS=self.timeout * 1000,
-                maxPoolSize=self.pool_size
+                maxPoolSize=self.pool_size + self.max_overflow,
+                minPoolSize=self.min_pool_size,
+                maxIdleTimeMS=self.MAX_IDLE_TIME_MS,
+                waitQueueTimeoutMS=self.pool_timeout * 1000
             )
             
             # Get database
@@ -66,6 +179,7 @@ class MongoDBConnector(BaseConnector):
                     self._db_name = 'admin'
             
             self._connection = self.client  # Set for is_connected() check
+            self._clear_caches()
         except Exception as e:
             raise ConnectionError(f"Failed to connect to MongoDB: {str(e)}")
     
@@ -76,25 +190,54 @@ class MongoDBConnector(BaseConnector):
             self.client = None
             self.db = None
             self._connection = None
+        self._clear_caches()
+    
+    def _clear_caches(self) -> None:
+        """Drop cached collection handles, schemas, collection names and capabilities."""
+        self._collections.clear()
+        self._schema_cache.clear()
+        self._collection_names = None
+        self.invalidate_metadata(include_capabilities=True)
+    
+    def _collection(self, name: str) -> Collection:
+        """Get a cached Collection handle for the current database."""
+        collection = self._collections.get(name)
+        if collection is None:
+            collection = self.db[name]
+            self._collections[name] = collection
+        return collection
+    
+    def _list_collection_names(self) -> List[str]:
+        """List collection names, reusing the result for a short TTL."""
+        now = time.monotonic()
+        if self._collection_names is not None:
+            fetched_at, names = self._collection_names
+            if now - fetched_at < self.COLLECTION_NAMES_TTL_SECONDS:
+                return names
+        
+        names = self.db.list_collection_names()
+        self._collection_names = (now, names)
+        return names
     
     def test_connection(self) -> HealthCheckResult:
         """Test MongoDB connection"""
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         try:
             if not self.client:
                 self.connect()
             
-            # Ping the database
-            self.client.admin.command('ping')
-            
-            response_time_ms = int((time.time() - start_time) * 1000)
+            # A recent monitor heartbeat already proves the server is reachable
+            response_time_ms = self._heartbeat_rtt_ms()
+            if response_time_ms is None:
+                self.client.admin.command('ping')
+                response_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
             return HealthCheckResult(
                 is_healthy=True,
                 response_time_ms=response_time_ms,
                 timestamp=datetime.utcnow()
             )
         except Exception as e:
-            response_time_ms = int((time.time() - start_time) * 1000)
+            response_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
             return HealthCheckResult(
                 is_healthy=False,
                 response_time_ms=response_time_ms,
@@ -102,6 +245,24 @@ class MongoDBConnector(BaseConnector):
                 timestamp=datetime.utcnow()
             )
     
+    def _heartbeat_rtt_ms(self) -> Optional[int]:
+        """
+        Get the heartbeat round-trip time if PyMongo's monitor saw a server recently.
+        
+        Returns None when no known server has reported within
+        HEARTBEAT_FRESHNESS_SECONDS, meaning a real command is needed.
+        """
+        now = time.monotonic()
+        round_trips = [
+            server.round_trip_time
+            for server in self.client.topology_description.known_servers
+            if now - server.last_update_time < self.HEARTBEAT_FRESHNESS_SECONDS
+            and server.round_trip_time is not None
+        ]
+        if not round_trips:
+            return None
+        return int(min(round_trips) * 1000)
+    
     def execute_query(self, sql: str, params: Optional[Dict[str, Any]] = None) -> QueryResult:
         """
         Execute MongoDB query (JSON format, not SQL)
@@ -116,7 +277,7 @@ class MongoDBConnector(BaseConnector):
             "limit": 100
         }
         """
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         try:
             if not self.client:
                 self.connect()
@@ -130,7 +291,7 @@ class MongoDBConnector(BaseConnector):
             if not collection_name:
                 raise ValueError("Collection name is required in query")
             
-            collection = self.db[collection_name]
+            collection = self._collection(collection_name)
             
             # Execute based on operation type
             if operation == 'find':
@@ -144,7 +305,7 @@ class MongoDBConnector(BaseConnector):
             else:
                 raise ValueError(f"Unsupported operation: {operation}")
             
-            execution_time_ms = int((time.time() - start_time) * 1000)
+            execution_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
             
             # Convert to QueryResult format
             columns = list(results[0].keys()) if results else []
@@ -158,7 +319,7 @@ class MongoDBConnector(BaseConnector):
             )
         
         except json.JSONDecodeError as e:
-            execution_time_ms = int((time.time() - start_time) * 1000)
+            execution_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
             return QueryResult(
                 status=QueryResultStatus.ERROR,
                 rows=[],
@@ -168,7 +329,7 @@ class MongoDBConnector(BaseConnector):
                 error_message=f"Invalid JSON query: {str(e)}"
             )
         except Exception as e:
-            execution_time_ms = int((time.time() - start_time) * 1000)
+            execution_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
             return QueryResult(
                 status=QueryResultStatus.ERROR,
                 rows=[],
@@ -194,50 +355,102 @@ class MongoDBConnector(BaseConnector):
             self.connect()
         return [self._db_name] if self._db_name else []
     
-    def list_tables(self, schema: str) -> List[TableInfo]:
-        """List collections (MongoDB equivalent of tables)"""
+    def list_tables(self, schema: str, include_size: bool = False) -> List[TableInfo]:
+        """
+        List collections (MongoDB equivalent of tables)
+        
+        Args:
+            schema: Database name (the connector's database is used)
+            include_size: Also fetch data sizes via $collStats; otherwise only
+                metadata document counts are read
+        """
         if not self.client:
             self.connect()
         
-        collections = self.db.list_collection_names()
+        collections = self._list_collection_names()
+        if not collections:
+            return []
+        
+        # Fetch stats concurrently instead of one serial command per collection
+        max_workers = min(len(collections), self.STATS_MAX_WORKERS)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            stats_fn = self._collection_stats if include_size else self._collection_count
+            all_stats = list(executor.map(stats_fn, collections))
         
         table_infos = []
-        for collection_name in collections:
-            try:
-                # Get collection stats
-                stats = self.db.command("collStats", collection_name)
-                
-                table_infos.append(TableInfo(
-                    name=collection_name,
-                    schema=self._db_name,
-                    table_type="collection",
-                    row_count=stats.get('count', 0),
-                    size_bytes=stats.get('size', 0)
-                ))
-            except Exception:
+        for collection_name, stats in zip(collections, all_stats):
+            if stats is None:
                 # If stats fail, still add the collection with minimal info
                 table_infos.append(TableInfo(
                     name=collection_name,
                     schema=self._db_name,
                     table_type="collection"
                 ))
+                continue
+            
+            table_infos.append(TableInfo(
+                name=collection_name,
+                schema=self._db_name,
+                table_type="collection",
+                row_count=stats['count'],
+                size_bytes=stats['size']
+            ))
         
         return table_infos
     
+    def _collection_count(self, collection_name: str) -> Optional[Dict[str, Optional[int]]]:
+        """
+        Get a collection's document count from metadata, without sizes.
+        
+        Returns None if the count is unavailable (e.g. views, missing privileges).
+        """
+        try:
+            return {'count': self._collection(collection_name).estimated_document_count(), 'size': None}
+        except Exception:
+            return None
+    
+    def _collection_stats(self, collection_name: str) -> Optional[Dict[str, int]]:
+        """
+        Get document count and data size for a collection via $collStats.
+        
+        Sharded collections return one document per shard, which are summed.
+        Returns None if stats are unavailable (e.g. views, missing privileges).
+        """
+        try:
+            cursor = self._collection(collection_name).aggregate([{"$collStats": {"storageStats": {}}}])
+            count = 0
+            size = 0
+            for shard_stats in cursor:
+                storage_stats = shard_stats.get('storageStats', {})
+                count += storage_stats.get('count', 0)
+                size += storage_stats.get('size', 0)
+            return {'count': count, 'size': size}
+        except Exception:
+            return None
+    
     def get_table_schema(self, table: str, schema: str) -> TableSchema:
-        """Get collection schema (inferred from sample documents)"""
+        """Get collection schema (inferred from sample documents, cached briefly)"""
         if not self.client:
             self.connect()
         
-        collection = self.db[table]
+        cache_key = (schema, table)
+        cached = self._schema_cache.get(cache_key)
+        if cached is not None and time.monotonic() - cached[0] < self.SCHEMA_CACHE_TTL_SECONDS:
+            return cached[1]
         
-        # Sample a few documents to infer schema
-        sample_docs = list(collection.find().limit(10))
+        collection = self._collection(table)
         
-        # Collect all unique fields
-        fields = set()
-        for doc in sample_docs:
-            fields.update(doc.keys())
+        # Sample documents and collect the unique top-level field names
+        # server-side, so only the names cross the wire
+        pipeline = [
+            {"$sample": {"size": self.SCHEMA_SAMPLE_SIZE}},
+            {"$project": {"_id": 0, "k": {"$map": {
+                "input": {"$objectToArray": "$$ROOT"}, "as": "kv", "in": "$$kv.k"
+            }}}},
+            {"$unwind": "$k"},
+            {"$group": {"_id": "$k"}}
+        ]
+        fields = [doc["_id"] for doc in collection.aggregate(pipeline)]
         
         # Create column info for each field
         columns = []
@@ -248,7 +461,7 @@ class MongoDBConnector(BaseConnector):
                 is_nullable=True
             ))
         
-        return TableSchema(
+        table_schema = TableSchema(
             table_name=table,
             schema_name=schema,
             columns=columns,
@@ -256,6 +469,8 @@ class MongoDBConnector(BaseConnector):
             foreign_keys=[],
             indexes=[]
         )
+        self._schema_cache[cache_key] = (time.monotonic(), table_schema)
+        return table_schema
     
     def start_transaction(self) -> None:
         """Begin a new transaction (MongoDB 4.0+)"""
@@ -273,13 +488,16 @@ class MongoDBConnector(BaseConnector):
     
     def detect_capabilities(self) -> DatabaseCapabilities:
         """Detect MongoDB capabilities"""
+        if self._capabilities is not None:
+            return self._capabilities
+        
         if not self.client:
             self.connect()
         
         server_info = self.client.server_info()
         version = server_info.get('version', 'Unknown')
         
-        return DatabaseCapabilities(
+        self._capabilities = DatabaseCapabilities(
             version=version,
             supports_transactions=True,  # MongoDB 4.0+
             supports_stored_procedures=False,
@@ -291,6 +509,7 @@ class MongoDBConnector(BaseConnector):
             features=["Document Store", "Aggregation Pipeline", "Geospatial", "Text Search"],
             extensions=[]
         )
+        return self._capabilities
     
     # Helper methods for MongoDB operations
     def _execute_find(self, collection, query_obj: Dict) -> List[Dict]:
@@ -309,12 +528,10 @@ class MongoDBConnector(BaseConnector):
         if sort:
             cursor = cursor.sort(list(sort.items()))
         
-        cursor = cursor.limit(limit)
+        cursor = cursor.limit(limit).batch_size(self.CURSOR_BATCH_SIZE)
         
-        results = list(cursor)
-        
-        # Convert ObjectId and datetime to strings
-        return self._serialize_documents(results)
+        # Convert ObjectId and datetime to strings while streaming the cursor
+        return self._serialize_documents(cursor)
     
     def _execute_aggregate(self, collection, query_obj: Dict) -> List[Dict]:
         """Execute aggregation pipeline"""
@@ -323,14 +540,22 @@ class MongoDBConnector(BaseConnector):
         if not isinstance(pipeline, list):
             raise ValueError("Pipeline must be a list of stages")
         
-        results = list(collection.aggregate(pipeline))
+        cursor = collection.aggregate(
+            pipeline,
+            batchSize=self.CURSOR_BATCH_SIZE,
+            allowDiskUse=query_obj.get('allowDiskUse', True)
+        )
         
-        return self._serialize_documents(results)
+        return self._serialize_documents(cursor)
     
     def _execute_count(self, collection, query_obj: Dict) -> List[Dict]:
         """Execute count operation"""
         filter_query = query_obj.get('filter', {})
-        count = collection.count_documents(filter_query)
+        if filter_query:
+            count = collection.count_documents(filter_query)
+        else:
+            # Unfiltered counts come from collection metadata, not a scan
+            count = collection.estimated_document_count()
         
         return [{"count": count}]
     
@@ -347,20 +572,22 @@ class MongoDBConnector(BaseConnector):
         # Convert to list of dicts
         return [{field: value} for value in distinct_values]
     
-    def _serialize_documents(self, documents: List[Dict]) -> List[Dict]:
-        """Convert MongoDB documents to JSON-serializable format"""
-        from bson import ObjectId
-        
-        def serialize_value(value):
-            if isinstance(value, ObjectId):
-                return str(value)
-            elif isinstance(value, datetime):
-                return value.isoformat()
-            elif isinstance(value, dict):
-                return {k: serialize_value(v) for k, v in value.items()}
-            elif isinstance(value, list):
-                return [serialize_value(item) for item in value]
-            else:
-                return value
+    def _serialize_documents(self, documents: Iterable[Dict]) -> List[Dict]:
+        """
+        Convert MongoDB documents to JSON-serializable format.
+        
+        Accepts a cursor so fetching and converting happen in one pass;
+        documents freshly decoded by the driver are converted in place by
+        a serializer specialized for the result's document shape.
+        """
+        iterator = iter(documents)
+        first = next(iterator, None)
+        if first is None:
+            return []
         
-        return [serialize_value(doc) for doc in documents]
+        # Results are usually uniform, so specialize on the first document
+        shape = tuple((field, type(value)) for field, value in first.items())
+        serialize = _document_serializer(shape)
+        results = [serialize(first)]
+        results.extend(serialize(doc) for doc in iterator)
+        return results
@@ -2,9 +2,11 @@
 MySQL/MariaDB Database Connector
 """
 from typing import Any, Dict, List, Optional
+from importlib.util import find_spec
 import time
 from datetime import datetime
 from sqlalchemy import create_engine, text, inspect
+from sqlalchemy.engine import URL, make_url
 from sqlalchemy.pool import QueuePool
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -16,9 +18,36 @@ from app.connections.connectors.base_connector import (
     TableInfo,
     ColumnInfo,
     TableSchema,
-    DatabaseCapabilities
+    DatabaseCapabilities,
+    STATEMENT_CACHE_SIZE,
+    STREAM_EXECUTION_OPTIONS,
+    cached_metadata,
+    cached_text,
+    fetch_query_result,
+    is_ddl,
+    is_select,
+    reflect_table
 )
 
+# Fixed statements, built once per process
+_SELECT_ONE = text("SELECT 1")
+_START_TRANSACTION = text("START TRANSACTION")
+_SELECT_CAPABILITIES = text("SELECT VERSION(), @@max_connections")
+
+
+# Dialects upgraded to the mysqlclient C driver when installed
+_UPGRADABLE_DRIVERS = ('mysql', 'mysql+pymysql')
+_PREFERRED_DRIVER = "mysql+mysqldb"
+_HAS_PREFERRED_DRIVER = find_spec("MySQLdb") is not None
+
+
+def _engine_url(connection_string: str) -> URL:
+    """Resolve the engine URL, preferring mysqlclient when available."""
+    url = make_url(connection_string)
+    if _HAS_PREFERRED_DRIVER and url.drivername in _UPGRADABLE_DRIVERS:
+        url = url.set(drivername=_PREFERRED_DRIVER)
+    return url
+
 
 class MySQLConnector(BaseConnector):
     """MySQL/MariaDB database connector implementation."""
@@ -27,20 +56,27 @@ class MySQLConnector(BaseConnector):
         """Establish connection to MySQL database."""
         try:
             self._engine = create_engine(
-                self.connection_string,
+                _engine_url(self.connection_string),
                 poolclass=QueuePool,
                 pool_size=self.pool_size,
-                max_overflow=self.pool_size * 2,
-                pool_pre_ping=True,
+                max_overflow=self.max_overflow,
+                pool_timeout=self.pool_timeout,
+                pool_pre_ping=self.pool_pre_ping,
+                query_cache_size=STATEMENT_CACHE_SIZE,
                 connect_args={'connect_timeout': self.timeout}
             )
             self._connection = self._engine.connect()
+            # Reflect through the engine so each lookup runs on a short-lived
+            # pooled connection instead of leaving the held one idle in
+            # transaction (or joining a transaction the user has open)
             self._inspector = inspect(self._engine)
         except Exception as e:
             raise ConnectionError(f"Failed to connect to MySQL: {str(e)}")
     
     def disconnect(self) -> None:
         """Close MySQL connection."""
+        self.invalidate_metadata(include_capabilities=True)
+        self._in_transaction = False
         if self._connection:
             self._connection.close()
             self._connection = None
@@ -50,22 +86,22 @@ class MySQLConnector(BaseConnector):
     
     def test_connection(self) -> HealthCheckResult:
         """Test MySQL connection health."""
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         try:
             if not self._connection:
                 self.connect()
             
-            result = self._connection.execute(text("SELECT 1"))
+            result = self._connection.execute(_SELECT_ONE)
             result.close()
             
-            response_time_ms = int((time.time() - start_time) * 1000)
+            response_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
             return HealthCheckResult(
                 is_healthy=True,
                 response_time_ms=response_time_ms,
                 timestamp=datetime.utcnow()
             )
         except Exception as e:
-            response_time_ms = int((time.time() - start_time) * 1000)
+            response_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
             return HealthCheckResult(
                 is_healthy=False,
                 response_time_ms=response_time_ms,
@@ -75,30 +111,21 @@ class MySQLConnector(BaseConnector):
     
     def execute_query(self, sql: str, params: Optional[Dict[str, Any]] = None) -> QueryResult:
         """Execute SQL query on MySQL."""
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         try:
-            if params:
-                result = self._connection.execute(text(sql), params)
-            else:
-                result = self._connection.execute(text(sql))
-            
-            rows = []
-            columns = []
-            if result.returns_rows:
-                columns = list(result.keys())
-                rows = [dict(row._mapping) for row in result]
+            options = STREAM_EXECUTION_OPTIONS if is_select(sql) else None
+            with self._query_connection() as connection:
+                result = connection.execute(
+                    cached_text(sql), params or None, execution_options=options
+                )
+                query_result = fetch_query_result(result)
+            if is_ddl(sql):
+                self.invalidate_metadata()
             
-            execution_time_ms = int((time.time() - start_time) * 1000)
-            
-            return QueryResult(
-                status=QueryResultStatus.SUCCESS,
-                rows=rows,
-                columns=columns,
-                row_count=len(rows),
-                execution_time_ms=execution_time_ms
-            )
+            query_result.execution_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
+            return query_result
         except SQLAlchemyError as e:
-            execution_time_ms = int((time.time() - start_time) * 1000)
+            execution_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
             return QueryResult(
                 status=QueryResultStatus.ERROR,
                 rows=[],
@@ -113,6 +140,7 @@ class MySQLConnector(BaseConnector):
         try:
             self._connection.execute(text(sql))
             self._connection.commit()
+            self.invalidate_metadata()
             return True
         except SQLAlchemyError:
             self._connection.rollback()
@@ -122,10 +150,12 @@ class MySQLConnector(BaseConnector):
         """List all MySQL databases."""
         return self.list_schemas()
     
+    @cached_metadata
     def list_schemas(self) -> List[str]:
         """List all MySQL databases/schemas."""
         return self._inspector.get_schema_names()
     
+    @cached_metadata
     def list_tables(self, schema: str) -> List[TableInfo]:
         """List all tables in a schema."""
         tables = []
@@ -146,10 +176,14 @@ class MySQLConnector(BaseConnector):
         
         return tables
     
+    @cached_metadata
     def get_table_schema(self, table: str, schema: str) -> TableSchema:
         """Get complete table schema."""
+        # Columns, keys and indexes are fetched concurrently
+        reflected = reflect_table(self._engine, table, schema)
+        
         columns = []
-        for col in self._inspector.get_columns(table, schema=schema):
+        for col in reflected['get_columns']:
             columns.append(ColumnInfo(
                 name=col['name'],
                 data_type=str(col['type']),
@@ -157,11 +191,9 @@ class MySQLConnector(BaseConnector):
                 default_value=str(col['default']) if col['default'] else None
             ))
         
-        pk_constraint = self._inspector.get_pk_constraint(table, schema=schema)
-        primary_keys = pk_constraint.get('constrained_columns', [])
-        
-        foreign_keys = self._inspector.get_foreign_keys(table, schema=schema)
-        indexes = self._inspector.get_indexes(table, schema=schema)
+        primary_keys = reflected['get_pk_constraint'].get('constrained_columns', [])
+        foreign_keys = reflected['get_foreign_keys']
+        indexes = reflected['get_indexes']
         
         return TableSchema(
             table_name=table,
@@ -174,25 +206,27 @@ class MySQLConnector(BaseConnector):
     
     def start_transaction(self) -> None:
         """Begin a new transaction."""
-        self._connection.execute(text("START TRANSACTION"))
+        self._connection.execute(_START_TRANSACTION)
+        self._in_transaction = True
     
     def commit(self) -> None:
         """Commit current transaction."""
         self._connection.commit()
+        self._in_transaction = False
     
     def rollback(self) -> None:
         """Rollback current transaction."""
         self._connection.rollback()
+        self._in_transaction = False
     
     def detect_capabilities(self) -> DatabaseCapabilities:
         """Detect MySQL capabilities."""
-        # Get version
-        version_result = self._connection.execute(text("SELECT VERSION()"))
-        version = version_result.fetchone()[0]
+        if self._capabilities is not None:
+            return self._capabilities
         
-        # Get max connections
-        max_conn_result = self._connection.execute(text("SHOW VARIABLES LIKE 'max_connections'"))
-        max_connections = int(max_conn_result.fetchone()[1])
+        # Get version and max connections in one round trip
+        row = self._connection.execute(_SELECT_CAPABILITIES).fetchone()
+        version, max_connections = row[0], int(row[1])
         
         # Check if MariaDB
         is_mariadb = "MariaDB" in version
@@ -201,7 +235,7 @@ class MySQLConnector(BaseConnector):
         if is_mariadb:
             features.append("MariaDB Extensions")
         
-        return DatabaseCapabilities(
+        self._capabilities = DatabaseCapabilities(
             version=version,
             supports_transactions=True,
             supports_stored_procedures=True,
@@ -213,3 +247,4 @@ class MySQLConnector(BaseConnector):
             features=features,
             extensions=[]
         )
+        return self._capabilities
@@ -2,9 +2,11 @@
 PostgreSQL Database Connector
 """
 from typing import Any, Dict, List, Optional
+from importlib.util import find_spec
 import time
 from datetime import datetime
 from sqlalchemy import create_engine, text, inspect
+from sqlalchemy.engine import URL, make_url
 from sqlalchemy.pool import QueuePool
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -16,9 +18,40 @@ from app.connections.connectors.base_connector import (
     TableInfo,
     ColumnInfo,
     TableSchema,
-    DatabaseCapabilities
+    DatabaseCapabilities,
+    STATEMENT_CACHE_SIZE,
+    STREAM_EXECUTION_OPTIONS,
+    cached_metadata,
+    cached_text,
+    fetch_query_result,
+    is_ddl,
+    is_select,
+    reflect_table
 )
 
+# Fixed statements, built once per process
+_SELECT_ONE = text("SELECT 1")
+_BEGIN = text("BEGIN")
+_LIST_DATABASES = text("SELECT datname FROM pg_database WHERE datistemplate = false")
+_SELECT_CAPABILITIES = text(
+    "SELECT version(), current_setting('max_connections')::int, "
+    "ARRAY(SELECT extname FROM pg_extension)"
+)
+
+
+# Dialects upgraded to psycopg 3 (C speedups, prepared statements) when installed
+_UPGRADABLE_DRIVERS = ('postgresql', 'postgresql+psycopg2')
+_PREFERRED_DRIVER = "postgresql+psycopg"
+_HAS_PREFERRED_DRIVER = find_spec("psycopg") is not None
+
+
+def _engine_url(connection_string: str) -> URL:
+    """Resolve the engine URL, preferring psycopg 3 when available."""
+    url = make_url(connection_string)
+    if _HAS_PREFERRED_DRIVER and url.drivername in _UPGRADABLE_DRIVERS:
+        url = url.set(drivername=_PREFERRED_DRIVER)
+    return url
+
 
 class PostgreSQLConnector(BaseConnector):
     """PostgreSQL database connector implementation."""
@@ -26,21 +59,33 @@ class PostgreSQLConnector(BaseConnector):
     def connect(self) -> None:
         """Establish connection to PostgreSQL database."""
         try:
+            url = _engine_url(self.connection_string)
+            connect_args = {'connect_timeout': self.timeout}
+            if url.drivername == _PREFERRED_DRIVER:
+                # Switch to server-side prepared statements after 5 runs
+                connect_args['prepare_threshold'] = 5
             self._engine = create_engine(
-                self.connection_string,
+                url,
                 poolclass=QueuePool,
                 pool_size=self.pool_size,
-                max_overflow=self.pool_size * 2,
-                pool_pre_ping=True,
-                connect_args={'connect_timeout': self.timeout}
+                max_overflow=self.max_overflow,
+                pool_timeout=self.pool_timeout,
+                pool_pre_ping=self.pool_pre_ping,
+                query_cache_size=STATEMENT_CACHE_SIZE,
+                connect_args=connect_args
             )
             self._connection = self._engine.connect()
+            # Reflect through the engine so each lookup runs on a short-lived
+            # pooled connection instead of leaving the held one idle in
+            # transaction (or joining a transaction the user has open)
             self._inspector = inspect(self._engine)
         except Exception as e:
             raise ConnectionError(f"Failed to connect to PostgreSQL: {str(e)}")
     
     def disconnect(self) -> None:
         """Close PostgreSQL connection."""
+        self.invalidate_metadata(include_capabilities=True)
+        self._in_transaction = False
         if self._connection:
             self._connection.close()
             self._connection = None
@@ -50,22 +95,22 @@ class PostgreSQLConnector(BaseConnector):
     
     def test_connection(self) -> HealthCheckResult:
         """Test PostgreSQL connection health."""
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         try:
             if not self._connection:
                 self.connect()
             
-            result = self._connection.execute(text("SELECT 1"))
+            result = self._connection.execute(_SELECT_ONE)
             result.close()
             
-            response_time_ms = int((time.time() - start_time) * 1000)
+            response_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
             return HealthCheckResult(
                 is_healthy=True,
                 response_time_ms=response_time_ms,
                 timestamp=datetime.utcnow()
             )
         except Exception as e:
-            response_time_ms = int((time.time() - start_time) * 1000)
+            response_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
             return HealthCheckResult(
                 is_healthy=False,
                 response_time_ms=response_time_ms,
@@ -75,31 +120,21 @@ class PostgreSQLConnector(BaseConnector):
     
     def execute_query(self, sql: str, params: Optional[Dict[str, Any]] = None) -> QueryResult:
         """Execute SQL query on PostgreSQL."""
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         try:
-            if params:
-                result = self._connection.execute(text(sql), params)
-            else:
-                result = self._connection.execute(text(sql))
-            
-            # Fetch results
-            rows = []
-            columns = []
-            if result.returns_rows:
-                columns = list(result.keys())
-                rows = [dict(row._mapping) for row in result]
+            options = STREAM_EXECUTION_OPTIONS if is_select(sql) else None
+            with self._query_connection() as connection:
+                result = connection.execute(
+                    cached_text(sql), params or None, execution_options=options
+                )
+                query_result = fetch_query_result(result)
+            if is_ddl(sql):
+                self.invalidate_metadata()
             
-            execution_time_ms = int((time.time() - start_time) * 1000)
-            
-            return QueryResult(
-                status=QueryResultStatus.SUCCESS,
-                rows=rows,
-                columns=columns,
-                row_count=len(rows),
-                execution_time_ms=execution_time_ms
-            )
+            query_result.execution_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
+            return query_result
         except SQLAlchemyError as e:
-            execution_time_ms = int((time.time() - start_time) * 1000)
+            execution_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
             return QueryResult(
                 status=QueryResultStatus.ERROR,
                 rows=[],
@@ -114,6 +149,7 @@ class PostgreSQLConnector(BaseConnector):
         try:
             self._connection.execute(text(sql))
             self._connection.commit()
+            self.invalidate_metadata()
             return True
         except SQLAlchemyError:
             self._connection.rollback()
@@ -121,13 +157,15 @@ class PostgreSQLConnector(BaseConnector):
             
     def list_databases(self) -> List[str]:
         """List all PostgreSQL databases."""
-        result = self._connection.execute(text("SELECT datname FROM pg_database WHERE datistemplate = false"))
+        result = self._connection.execute(_LIST_DATABASES)
         return [row[0] for row in result]
     
+    @cached_metadata
     def list_schemas(self) -> List[str]:
         """List all PostgreSQL schemas."""
         return self._inspector.get_schema_names()
     
+    @cached_metadata
     def list_tables(self, schema: str) -> List[TableInfo]:
         """List all tables in a schema."""
         tables = []
@@ -148,10 +186,14 @@ class PostgreSQLConnector(BaseConnector):
         
         return tables
     
+    @cached_metadata
     def get_table_schema(self, table: str, schema: str) -> TableSchema:
         """Get complete table schema."""
+        # Columns, keys and indexes are fetched concurrently
+        reflected = reflect_table(self._engine, table, schema)
+        
         columns = []
-        for col in self._inspector.get_columns(table, schema=schema):
+        for col in reflected['get_columns']:
             columns.append(ColumnInfo(
                 name=col['name'],
                 data_type=str(col['type']),
@@ -159,15 +201,9 @@ class PostgreSQLConnector(BaseConnector):
                 default_value=str(col['default']) if col['default'] else None
             ))
         
-        # Get primary keys
-        pk_constraint = self._inspector.get_pk_constraint(table, schema=schema)
-        primary_keys = pk_constraint.get('constrained_columns', [])
-        
-        # Get foreign keys
-        foreign_keys = self._inspector.get_foreign_keys(table, schema=schema)
-        
-        # Get indexes
-        indexes = self._inspector.get_indexes(table, schema=schema)
+        primary_keys = reflected['get_pk_constraint'].get('constrained_columns', [])
+        foreign_keys = reflected['get_foreign_keys']
+        indexes = reflected['get_indexes']
         
         return TableSchema(
             table_name=table,
@@ -180,32 +216,31 @@ class PostgreSQLConnector(BaseConnector):
     
     def start_transaction(self) -> None:
         """Begin a new transaction."""
-        self._connection.execute(text("BEGIN"))
+        self._connection.execute(_BEGIN)
+        self._in_transaction = True
     
     def commit(self) -> None:
         """Commit current transaction."""
         self._connection.commit()
+        self._in_transaction = False
     
     def rollback(self) -> None:
         """Rollback current transaction."""
         self._connection.rollback()
+        self._in_transaction = False
     
     def detect_capabilities(self) -> DatabaseCapabilities:
         """Detect PostgreSQL capabilities."""
-        # Get version
-        version_result = self._connection.execute(text("SELECT version()"))
-        version_row = version_result.fetchone()
-        version = version_row[0] if version_row else "Unknown"
-        
-        # Get extensions
-        extensions_result = self._connection.execute(text("SELECT extname FROM pg_extension"))
-        extensions = [row[0] for row in extensions_result]
+        if self._capabilities is not None:
+            return self._capabilities
         
-        # Get max connections
-        max_conn_result = self._connection.execute(text("SHOW max_connections"))
-        max_connections = int(max_conn_result.fetchone()[0])
+        # Get version, max connections and extensions in one round trip
+        row = self._connection.execute(_SELECT_CAPABILITIES).fetchone()
+        version = row[0] or "Unknown"
+        max_connections = row[1]
+        extensions = list(row[2] or [])
         
-        return DatabaseCapabilities(
+        self._capabilities = DatabaseCapabilities(
             version=version,
             supports_transactions=True,
             supports_stored_procedures=True,
@@ -217,3 +252,4 @@ class PostgreSQLConnector(BaseConnector):
             features=["ACID", "Foreign Keys", "Triggers", "Stored Procedures", "JSON", "Full Text Search"],
             extensions=extensions
         )
+        return self._capabilities
@@ -1,10 +1,14 @@
 """
 SQLite Database Connector
 """
-from typing import Any, Dict, List, Optional
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+import os
 import time
 from datetime import datetime
-from sqlalchemy import create_engine, text, inspect
+from sqlalchemy import create_engine, event, text, inspect
+from sqlalchemy.engine import Connection, Engine, make_url
+from sqlalchemy.pool import QueuePool
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.connections.connectors.base_connector import (
@@ -15,52 +19,134 @@ from app.connections.connectors.base_connector import (
     TableInfo,
     ColumnInfo,
     TableSchema,
-    DatabaseCapabilities
+    DatabaseCapabilities,
+    cached_metadata,
+    cached_text,
+    fetch_query_result,
+    is_ddl,
+    is_select
 )
 
+# Fixed statements, built once per process
+_SELECT_ONE = text("SELECT 1")
+_BEGIN_IMMEDIATE = text("BEGIN IMMEDIATE")
+_SELECT_VERSION = text("SELECT sqlite_version()")
+
+# Applied to every new DBAPI connection: WAL lets readers run alongside the
+# writer and NORMAL sync skips the per-commit fsync (still safe under WAL).
+# The busy timeout comes from connect_args={'timeout': ...}.
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA foreign_keys=ON",
+)
+
+
+def _apply_pragmas(dbapi_connection, connection_record) -> None:
+    """Engine "connect" listener that applies PRAGMAS."""
+    cursor = dbapi_connection.cursor()
+    for pragma in PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
 
 class SQLiteConnector(BaseConnector):
-    """SQLite database connector implementation."""
+    """
+    SQLite database connector implementation.
+    
+    File databases get a single writer connection (SQLite allows one writer
+    at a time) plus a read-only pool, so health checks and reads don't queue
+    behind writes. In-memory databases can't be shared between connections
+    and use the writer connection for everything.
+    """
+    
+    # Read-only engine, None when reads share the writer connection
+    _read_engine: Optional[Engine] = None
     
     def connect(self) -> None:
         """Establish connection to SQLite database."""
         try:
-            self._engine = create_engine(
-                self.connection_string,
-                connect_args={'timeout': self.timeout}
-            )
+            url = make_url(self.connection_string)
+            # In-memory and URI databases stay on one connection
+            single_connection = url.database in (None, '', ':memory:') or url.database.startswith('file:')
+            
+            if single_connection:
+                self._engine = create_engine(url, connect_args={'timeout': self.timeout})
+            else:
+                self._engine = create_engine(
+                    url,
+                    poolclass=QueuePool,
+                    pool_size=1,
+                    max_overflow=0,
+                    connect_args={'timeout': self.timeout}
+                )
+            event.listen(self._engine, "connect", _apply_pragmas)
+            # Opened first so the file exists (and is in WAL mode) for readers
             self._connection = self._engine.connect()
-            self._inspector = inspect(self._engine)
+            
+            if single_connection:
+                self._read_engine = None
+                # The pool holds just this one connection; pysqlite only opens
+                # a transaction for DML, so reflecting here never starts one
+                self._inspector = inspect(self._connection)
+            else:
+                read_url = url.set(database=f"file:{url.database}", query={'mode': 'ro', 'uri': 'true'})
+                self._read_engine = create_engine(
+                    read_url,
+                    poolclass=QueuePool,
+                    pool_size=os.cpu_count() or 4,
+                    max_overflow=0,
+                    pool_timeout=self.pool_timeout,
+                    connect_args={'timeout': self.timeout}
+                )
+                event.listen(self._read_engine, "connect", _apply_pragmas)
+                self._inspector = inspect(self._read_engine)
         except Exception as e:
             raise ConnectionError(f"Failed to connect to SQLite: {str(e)}")
     
     def disconnect(self) -> None:
         """Close SQLite connection."""
+        self.invalidate_metadata(include_capabilities=True)
+        self._in_transaction = False
         if self._connection:
             self._connection.close()
             self._connection = None
+        if self._read_engine:
+            self._read_engine.dispose()
+            self._read_engine = None
         if self._engine:
             self._engine.dispose()
             self._engine = None
     
+    @contextmanager
+    def _read_connection(self) -> Iterator[Connection]:
+        """Get a connection from the read-only pool (the writer if there is none)."""
+        if self._read_engine is None:
+            yield self._connection
+        else:
+            with self._read_engine.connect() as connection:
+                yield connection
+    
     def test_connection(self) -> HealthCheckResult:
         """Test SQLite connection health."""
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         try:
             if not self._connection:
                 self.connect()
             
-            result = self._connection.execute(text("SELECT 1"))
-            result.close()
+            with self._read_connection() as connection:
+                connection.execute(_SELECT_ONE).close()
             
-            response_time_ms = int((time.time() - start_time) * 1000)
+            response_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
             return HealthCheckResult(
                 is_healthy=True,
                 response_time_ms=response_time_ms,
                 timestamp=datetime.utcnow()
             )
         except Exception as e:
-            response_time_ms = int((time.time() - start_time) * 1000)
+            response_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
             return HealthCheckResult(
                 is_healthy=False,
                 response_time_ms=response_time_ms,
@@ -69,31 +155,32 @@ class SQLiteConnector(BaseConnector):
             )
     
     def execute_query(self, sql: str, params: Optional[Dict[str, Any]] = None) -> QueryResult:
-        """Execute SQL query on SQLite."""
-        start_time = time.time()
+        """
+        Execute SQL query on SQLite.
+        
+        SELECTs outside a transaction use the read pool. Everything else runs
+        on the writer connection and, outside a transaction, is committed.
+        """
+        start_ns = time.perf_counter_ns()
         try:
-            if params:
-                result = self._connection.execute(text(sql), params)
+            if is_select(sql) and not self._in_transaction:
+                with self._read_connection() as connection:
+                    result = connection.execute(cached_text(sql), params or None)
+                    query_result = fetch_query_result(result)
             else:
-                result = self._connection.execute(text(sql))
-            
-            rows = []
-            columns = []
-            if result.returns_rows:
-                columns = list(result.keys())
-                rows = [dict(row._mapping) for row in result]
+                result = self._connection.execute(cached_text(sql), params or None)
+                query_result = fetch_query_result(result)
+                if not self._in_transaction:
+                    self._connection.commit()
+                if is_ddl(sql):
+                    self.invalidate_metadata()
             
-            execution_time_ms = int((time.time() - start_time) * 1000)
-            
-            return QueryResult(
-                status=QueryResultStatus.SUCCESS,
-                rows=rows,
-                columns=columns,
-                row_count=len(rows),
-                execution_time_ms=execution_time_ms
-            )
+            query_result.execution_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
+            return query_result
         except SQLAlchemyError as e:
-            execution_time_ms = int((time.time() - start_time) * 1000)
+            if not self._in_transaction and self._connection is not None:
+                self._connection.rollback()
+            execution_time_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
             return QueryResult(
                 status=QueryResultStatus.ERROR,
                 rows=[],
@@ -108,6 +195,7 @@ class SQLiteConnector(BaseConnector):
         try:
             self._connection.execute(text(sql))
             self._connection.commit()
+            self.invalidate_metadata()
             return True
         except SQLAlchemyError:
             self._connection.rollback()
@@ -121,6 +209,7 @@ class SQLiteConnector(BaseConnector):
         """List all SQLite schemas (always returns ['main'])."""
         return ['main']
     
+    @cached_metadata
     def list_tables(self, schema: str = 'main') -> List[TableInfo]:
         """List all tables in SQLite database."""
         tables = []
@@ -141,6 +230,7 @@ class SQLiteConnector(BaseConnector):
         
         return tables
     
+    @cached_metadata
     def get_table_schema(self, table: str, schema: str = 'main') -> TableSchema:
         """Get complete table schema."""
         columns = []
@@ -168,24 +258,36 @@ class SQLiteConnector(BaseConnector):
         )
     
     def start_transaction(self) -> None:
-        """Begin a new transaction."""
-        self._connection.execute(text("BEGIN"))
+        """
+        Begin a new transaction on the writer connection.
+        
+        BEGIN IMMEDIATE takes the write lock up front, so a concurrent writer
+        waits on the busy timeout here instead of failing with SQLITE_BUSY
+        when a deferred transaction tries to upgrade its lock mid-way.
+        """
+        self._connection.execute(_BEGIN_IMMEDIATE)
+        self._in_transaction = True
     
     def commit(self) -> None:
         """Commit current transaction."""
         self._connection.commit()
+        self._in_transaction = False
     
     def rollback(self) -> None:
         """Rollback current transaction."""
         self._connection.rollback()
+        self._in_transaction = False
     
     def detect_capabilities(self) -> DatabaseCapabilities:
         """Detect SQLite capabilities."""
+        if self._capabilities is not None:
+            return self._capabilities
+        
         # Get version
-        version_result = self._connection.execute(text("SELECT sqlite_version()"))
-        version = version_result.fetchone()[0]
+        with self._read_connection() as connection:
+            version = connection.execute(_SELECT_VERSION).scalar()
         
-        return DatabaseCapabilities(
+        self._capabilities = DatabaseCapabilities(
             version=f"SQLite {version}",
             supports_transactions=True,
             supports_stored_procedures=False,  # SQLite doesn't support stored procedures
@@ -197,3 +299,4 @@ class SQLiteConnector(BaseConnector):
             features=["ACID", "Triggers", "Views", "JSON", "Full Text Search (FTS5)"],
             extensions=[]
         )
+        return self._capabilities
@@ -1,15 +1,20 @@
 """
 Health Monitor Service - Monitors connection health
 """
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+import asyncio
+import io
 import logging
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.models.connection import ConnectionProfile, HealthStatus
 from app.models.connection_health import ConnectionHealthLog
 from app.connections.connection_manager import connection_manager
-from app.core.crypto import decrypt_password
+from app.core.audit import bulk_insert
 
 logger = logging.getLogger(__name__)
 
@@ -22,10 +27,27 @@ class HealthMonitor:
     connection status in the database.
     """
     
+    # Upper bound on health probes running at once in monitor_all_connections
+    MAX_CONCURRENT_CHECKS = 16
+    
+    # Sweeps logging at least this many rows on PostgreSQL use COPY
+    COPY_MIN_ROWS = 50
+    
+    # Columns a sweep writes per health log row; id and timestamp use
+    # their database defaults
+    LOG_COLUMNS = ("connection_id", "status", "response_time_ms", "error_message", "checked_by")
+    
     async def monitor_all_connections(self, db: Session) -> None:
         """
         Monitor health of all active connections.
         
+        Probes run concurrently; database updates stay on the event loop
+        thread, so the shared session is never used from two threads. Each
+        connection's writes go in their own SAVEPOINT, so one failing row
+        doesn't abort the sweep. Health log rows are collected instead of
+        added one by one and written in one go (see write_health_logs),
+        and the whole sweep is committed once at the end.
+        
         Args:
             db: Database session
         """
@@ -33,57 +55,96 @@ class HealthMonitor:
             ConnectionProfile.is_active == True
         ).all()
         
-        for connection in connections:
-            await self.check_connection(db, connection)
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_CHECKS)
+        pending_logs: List[Dict[str, Any]] = []
+        
+        async def check(connection: ConnectionProfile) -> HealthStatus:
+            async with semaphore:
+                return await self.check_connection(db, connection, commit=False, pending_logs=pending_logs)
+        
+        results = await asyncio.gather(*(check(connection) for connection in connections), return_exceptions=True)
+        for connection, result in zip(connections, results):
+            if isinstance(result, Exception):
+                logger.error(f"Could not record health check for {connection.name}: {str(result)}")
+        try:
+            with db.begin_nested():
+                self.write_health_logs(db, pending_logs)
+        except IntegrityError:
+            # A profile was deleted mid-sweep; keep the rows of the others
+            checked_ids = {row["connection_id"] for row in pending_logs}
+            live_ids = set(db.scalars(
+                select(ConnectionProfile.id).where(ConnectionProfile.id.in_(checked_ids))
+            ))
+            self.write_health_logs(db, [row for row in pending_logs if row["connection_id"] in live_ids])
+        db.commit()
     
-    async def check_connection(self, db: Session, connection: ConnectionProfile) -> HealthStatus:
+    async def check_connection(
+        self,
+        db: Session,
+        connection: ConnectionProfile,
+        commit: bool = True,
+        pending_logs: Optional[List[Dict[str, Any]]] = None
+    ) -> HealthStatus:
         """
         Check health of a single connection.
         
         Args:
             db: Database session
             connection: ConnectionProfile to check
+            commit: Commit the status update and log entry; batch callers
+                pass False, get a SAVEPOINT per connection instead and
+                commit once themselves
+            pending_logs: When given, the health log row is appended here
+                for the caller to bulk insert instead of being added to the
+                session; only once its savepoint was released
             
         Returns:
             HealthStatus enum value
         """
         try:
-            # Decrypt password
-            decrypted_password = decrypt_password(connection.encrypted_password)
+            # Get or create connector; the manager only decrypts the password
+            # when it has to build one, and caches the plaintext per ciphertext
+            connector = connection_manager.get_connector(connection)
             
-            # Get or create connector
-            connector = connection_manager.get_connector(connection, decrypted_password)
+            # Perform health check off the event loop; the probe is blocking I/O
+            health_result = await asyncio.to_thread(connector.test_connection)
             
-            # Perform health check
-            health_result = connector.test_connection()
-            
-            # Determine status
-            if health_result.is_healthy:
-                new_status = HealthStatus.ONLINE
-                connection.failed_attempts = 0
-            else:
-                connection.failed_attempts += 1
-                if connection.failed_attempts >= 3:
-                    new_status = HealthStatus.OFFLINE
+            # Record the result; nothing is awaited inside the block, so the
+            # savepoint can't interleave with another connection's
+            with self._savepoint(db, enabled=not commit):
+                # Determine status
+                if health_result.is_healthy:
+                    new_status = HealthStatus.ONLINE
+                    connection.failed_attempts = 0
                 else:
-                    new_status = HealthStatus.DEGRADED
+                    connection.failed_attempts += 1
+                    if connection.failed_attempts >= 3:
+                        new_status = HealthStatus.OFFLINE
+                    else:
+                        new_status = HealthStatus.DEGRADED
+                
+                # Update connection profile
+                connection.health_status = new_status
+                connection.last_health_check = health_result.timestamp
+                connection.response_time_ms = health_result.response_time_ms
+                
+                # Log health check
+                log_row = self._record_health_status(
+                    db,
+                    pending_logs,
+                    connection_id=connection.id,
+                    status=new_status.value,
+                    response_time_ms=health_result.response_time_ms,
+                    error_message=health_result.error_message
+                )
             
-            # Update connection profile
-            connection.health_status = new_status
-            connection.last_health_check = health_result.timestamp
-            connection.response_time_ms = health_result.response_time_ms
+            # Only queued once the savepoint released; a failed one must not
+            # leave its row behind for the sweep's bulk write
+            if pending_logs is not None:
+                pending_logs.append(log_row)
             
-            # Log health check
-            self.log_health_status(
-                db=db,
-                connection_id=connection.id,
-                status=new_status.value,
-                response_time_ms=health_result.response_time_ms,
-                error_message=health_result.error_message,
-                checked_by="system"
-            )
-            
-            db.commit()
+            if commit:
+                db.commit()
             
             logger.info(f"Health check for {connection.name}: {new_status.value} ({health_result.response_time_ms}ms)")
             
@@ -92,24 +153,101 @@ class HealthMonitor:
         except Exception as e:
             logger.error(f"Health check failed for {connection.name}: {str(e)}")
             
-            # Update as offline
-            connection.health_status = HealthStatus.OFFLINE
-            connection.failed_attempts += 1
-            connection.last_health_check = datetime.utcnow()
+            with self._savepoint(db, enabled=not commit):
+                # Update as offline
+                connection.health_status = HealthStatus.OFFLINE
+                connection.failed_attempts += 1
+                connection.last_health_check = datetime.utcnow()
+                
+                log_row = self._record_health_status(
+                    db,
+                    pending_logs,
+                    connection_id=connection.id,
+                    status=HealthStatus.OFFLINE.value,
+                    response_time_ms=0,
+                    error_message=str(e)
+                )
             
-            self.log_health_status(
-                db=db,
-                connection_id=connection.id,
-                status=HealthStatus.OFFLINE.value,
-                response_time_ms=0,
-                error_message=str(e),
-                checked_by="system"
-            )
+            if pending_logs is not None:
+                pending_logs.append(log_row)
             
-            db.commit()
+            if commit:
+                db.commit()
             
             return HealthStatus.OFFLINE
     
+    def write_health_logs(self, db: Session, rows: List[Dict[str, Any]]) -> None:
+        """
+        Write a sweep's health log rows in a single statement.
+        
+        Large sweeps on PostgreSQL stream the rows with COPY, which skips
+        per-row statement processing entirely; otherwise (and on other
+        dialects) the rows go out as one executemany INSERT. Neither
+        commits.
+        
+        Args:
+            db: Database session
+            rows: Values for LOG_COLUMNS, one dict per row
+        """
+        if len(rows) < self.COPY_MIN_ROWS or db.get_bind().dialect.name != "postgresql":
+            bulk_insert(db, ConnectionHealthLog, rows)
+            return
+        
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write(",".join(self._csv_field(row.get(column)) for column in self.LOG_COLUMNS))
+            buffer.write("\n")
+        buffer.seek(0)
+        
+        copy_sql = (
+            f"COPY {ConnectionHealthLog.__tablename__} ({', '.join(self.LOG_COLUMNS)}) "
+            "FROM STDIN WITH (FORMAT CSV)"
+        )
+        # The session's own connection, so the rows share the sweep's transaction
+        cursor = db.connection().connection.cursor()
+        try:
+            if hasattr(cursor, 'copy_expert'):  # psycopg2
+                cursor.copy_expert(copy_sql, buffer)
+            else:  # psycopg 3
+                with cursor.copy(copy_sql) as copy:
+                    copy.write(buffer.getvalue())
+        finally:
+            cursor.close()
+    
+    @staticmethod
+    def _csv_field(value: Any) -> str:
+        """Render a value for COPY CSV; unquoted empty is NULL, strings are always quoted."""
+        if value is None:
+            return ""
+        if isinstance(value, str):
+            return '"' + value.replace('"', '""') + '"'
+        return str(value)
+    
+    @staticmethod
+    @contextmanager
+    def _savepoint(db: Session, enabled: bool):
+        """Run the block inside a SAVEPOINT when enabled, flushing on exit."""
+        if not enabled:
+            yield
+            return
+        with db.begin_nested():
+            yield
+    
+    def _record_health_status(
+        self,
+        db: Session,
+        pending_logs: Optional[List[Dict[str, Any]]],
+        **values: Any
+    ) -> Dict[str, Any]:
+        """
+        Build a system health log row; without pending_logs it is also
+        added to the session right away.
+        """
+        row = {**values, "checked_by": "system"}
+        if pending_logs is None:
+            self.log_health_status(db=db, commit=False, **row)
+        return row
+    
     def log_health_status(
         self,
         db: Session,
@@ -117,7 +255,8 @@ class HealthMonitor:
         status: str,
         response_time_ms: int,
         error_message: Optional[str] = None,
-        checked_by: str = "system"
+        checked_by: str = "system",
+        commit: bool = True
     ) -> ConnectionHealthLog:
         """
         Log health check result.
@@ -129,6 +268,8 @@ class HealthMonitor:
             response_time_ms: Response time in milliseconds
             error_message: Error message if check failed
             checked_by: Who triggered the check
+            commit: Commit immediately; otherwise the entry is only added to
+                the session and goes out with the caller's commit
             
         Returns:
             Created ConnectionHealthLog instance
@@ -141,15 +282,17 @@ class HealthMonitor:
             checked_by=checked_by
         )
         db.add(log)
-        db.commit()
+        if commit:
+            db.commit()
         return log
     
     def get_health_history(
         self,
         db: Session,
         connection_id: int,
-        hours: int = 24
-    ) -> List[ConnectionHealthLog]:
+        hours: int = 24,
+        columns: Optional[List[str]] = None
+    ) -> List[Any]:
         """
         Get health check history for a connection.
         
@@ -157,13 +300,23 @@ class HealthMonitor:
             db: Database session
             connection_id: Connection profile ID
             hours: Number of hours to look back
+            columns: ConnectionHealthLog column names to select; when given,
+                lightweight rows with just those attributes are returned
+                instead of ORM objects
             
         Returns:
-            List of ConnectionHealthLog entries
+            List of ConnectionHealthLog entries (or rows, see columns),
+            newest first
         """
         since = datetime.utcnow() - timedelta(hours=hours)
         
-        return db.query(ConnectionHealthLog).filter(
+        if columns:
+            query = db.query(*(getattr(ConnectionHealthLog, name) for name in columns))
+        else:
+            query = db.query(ConnectionHealthLog)
+        
+        # Served by the (connection_id, timestamp) index as one range scan
+        return query.filter(
             ConnectionHealthLog.connection_id == connection_id,
             ConnectionHealthLog.timestamp >= since
         ).order_by(ConnectionHealthLog.timestamp.desc()).all()
@@ -7,7 +7,7 @@ from app.core.auth import (
     get_user_by_id, get_user_by_email
 )
 from app.core.rbac import (
-    get_current_user, get_current_active_user, get_current_superuser,
+    get_current_user, get_current_superuser,
     require_permission, require_permissions,
     DatasetAccessChecker, PermissionDeniedError, UnauthorizedError,
     initialize_rbac, DEFAULT_PERMISSIONS, DEFAULT_ROLES
@@ -20,7 +20,7 @@ __all__ = [
     "verify_token", "authenticate_user", "refresh_access_token",
     "get_user_by_id", "get_user_by_email",
     # RBAC
-    "get_current_user", "get_current_active_user", "get_current_superuser",
+    "get_current_user", "get_current_superuser",
     "require_permission", "require_permissions",
     "DatasetAccessChecker", "PermissionDeniedError", "UnauthorizedError",
     "initialize_rbac", "DEFAULT_PERMISSIONS", "DEFAULT_ROLES",
@@ -2,7 +2,11 @@
 Audit Logging Service
 """
 from datetime import datetime
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from typing import Optional, Dict, Any, List
+from sqlalchemy import Integer, case, cast, func, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 import structlog
 import hashlib
@@ -11,6 +15,62 @@ from app.models import AuditLog, QueryHistory, User
 
 logger = structlog.get_logger()
 
+# Longest query text stored on an audit entry
+MAX_AUDIT_QUERY_LENGTH = 10000
+
+# Dialects whose INSERT supports ON CONFLICT DO UPDATE
+UPSERT_INSERTS = {
+    "postgresql": pg_insert,
+    "sqlite": sqlite_insert,
+}
+
+
+def bulk_insert(db: Session, model, rows: List[Dict[str, Any]]) -> int:
+    """
+    Insert many log rows with a single executemany INSERT.
+    
+    Unlike session.add per row, no ORM objects are built and the rows go
+    out as batched multi-row INSERTs instead of one statement each. The
+    statement targets the Table rather than the mapped class: the ORM bulk
+    path would only re-process each dict against the mapper, which takes
+    about as long as the INSERT itself. The rows are not committed; the
+    caller's commit covers them.
+    
+    Args:
+        db: Database session
+        model: Mapped class to insert into (e.g. AuditLog)
+        rows: Column values, one dict per row
+    
+    Returns:
+        Number of rows inserted
+    """
+    if not rows:
+        return 0
+    db.execute(insert(model.__table__), rows)
+    return len(rows)
+
+
+# Hex digits kept from the query SHA-256 (128 bits); plenty for dedup
+QUERY_HASH_LENGTH = 32
+
+# Empty SHA-256 context; copying it is cheaper than constructing a new one.
+# Not used for security, so OpenSSL may pick its fastest implementation
+_SHA256_PROTOTYPE = hashlib.sha256(usedforsecurity=False)
+
+
+@lru_cache(maxsize=4096)
+def _hash_query_text(query: str) -> str:
+    """
+    Hash a query for deduplication, ignoring case and whitespace.
+    
+    Cached on the raw text: dashboards re-run the same queries, so repeats
+    skip normalization and hashing.
+    """
+    normalized = " ".join(query.lower().split())
+    hasher = _SHA256_PROTOTYPE.copy()
+    hasher.update(normalized.encode("utf-8", "surrogatepass"))
+    return hasher.hexdigest()[:QUERY_HASH_LENGTH]
+
 
 class AuditLogger:
     """Centralized audit logging service."""
@@ -33,9 +93,17 @@ class AuditLogger:
         rows_affected: Optional[int] = None,
         ip_address: Optional[str] = None,
         user_agent: Optional[str] = None,
-        connection_id: Optional[int] = None
+        connection_id: Optional[int] = None,
+        commit: bool = False
     ) -> AuditLog:
-        """Create an audit log entry."""
+        """
+        Create an audit log entry.
+        
+        The entry is flushed, not committed: request sessions commit once
+        at the end of the request (see get_app_db), so the audit row and
+        the action it records succeed or fail together. Callers outside a
+        request pass commit=True.
+        """
         audit = AuditLog(
             user_id=user.id if user else None,
             user_email=user.email if user else None,
@@ -55,7 +123,10 @@ class AuditLogger:
         )
         
         self.db.add(audit)
-        self.db.commit()
+        if commit:
+            self.db.commit()
+        else:
+            self.db.flush()
         
         # Also log to structured logger
         log_method = logger.info if status == "success" else logger.warning
@@ -102,7 +173,7 @@ class AuditLogger:
             action="query_execute",
             user=user,
             resource_type="sql",
-            query_text=query[:10000],  # Truncate very long queries
+            query_text=query[:MAX_AUDIT_QUERY_LENGTH],  # Truncate very long queries; short ones are not copied
             status="success" if success else "failure",
             error_message=error,
             duration_ms=duration_ms,
@@ -143,13 +214,58 @@ class QueryHistoryManager:
     
     def _hash_query(self, query: str) -> str:
         """Generate hash for query deduplication."""
-        normalized = " ".join(query.lower().split())
-        return hashlib.sha256(normalized.encode()).hexdigest()
+        return _hash_query_text(query)
     
     def record_query(self, user_id: int, query: str, duration_ms: int, connection_id: int = None) -> QueryHistory:
-        """Record a query execution."""
+        """
+        Record a query execution.
+        
+        On PostgreSQL and SQLite this is a single INSERT ... ON CONFLICT DO
+        UPDATE against the (user_id, query_hash) unique index, so concurrent
+        recorders of the same query cannot both insert a row. Like audit
+        entries, the row is left for the request session's commit.
+        """
         query_hash = self._hash_query(query)
+        now = datetime.utcnow()
+        
+        insert = UPSERT_INSERTS.get(self.db.get_bind().dialect.name)
+        if insert is None:
+            return self._record_query_fallback(user_id, query, query_hash, duration_ms, now)
+        
+        table = QueryHistory.__table__
+        stmt = insert(QueryHistory).values(
+            user_id=user_id,
+            query_text=query,
+            query_hash=query_hash,
+            execution_count=1,
+            last_executed_at=now,
+            avg_duration_ms=duration_ms
+        )
+        # Incremental mean over all executions; SET sees the pre-update row
+        new_count = table.c.execution_count + 1
+        avg_duration = case(
+            (table.c.avg_duration_ms.is_(None), stmt.excluded.avg_duration_ms),
+            else_=table.c.avg_duration_ms + cast(
+                func.round((stmt.excluded.avg_duration_ms - table.c.avg_duration_ms) * 1.0 / new_count),
+                Integer
+            )
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['user_id', 'query_hash'],
+            set_={
+                'execution_count': new_count,
+                'last_executed_at': stmt.excluded.last_executed_at,
+                'avg_duration_ms': avg_duration,
+            }
+        ).returning(QueryHistory)
         
+        return self.db.scalars(
+            stmt, execution_options={"populate_existing": True}
+        ).one()
+    
+    def _record_query_fallback(self, user_id: int, query: str, query_hash: str,
+                               duration_ms: int, now: datetime) -> QueryHistory:
+        """Record a query with SELECT then UPDATE/INSERT on dialects without upsert."""
         # Check for existing query
         existing = self.db.query(QueryHistory).filter(
             QueryHistory.user_id == user_id,
@@ -159,12 +275,14 @@ class QueryHistoryManager:
         if existing:
             # Update existing
             existing.execution_count += 1
-            existing.last_executed_at = datetime.utcnow()
-            if existing.avg_duration_ms:
-                existing.avg_duration_ms = (existing.avg_duration_ms + duration_ms) // 2
+            existing.last_executed_at = now
+            if existing.avg_duration_ms is not None:
+                # Incremental mean over all executions
+                count = existing.execution_count
+                existing.avg_duration_ms += round((duration_ms - existing.avg_duration_ms) / count)
             else:
                 existing.avg_duration_ms = duration_ms
-            self.db.commit()
+            self.db.flush()
             return existing
         else:
             # Create new
@@ -172,11 +290,11 @@ class QueryHistoryManager:
                 user_id=user_id,
                 query_text=query,
                 query_hash=query_hash,
-                last_executed_at=datetime.utcnow(),
+                last_executed_at=now,
                 avg_duration_ms=duration_ms
             )
             self.db.add(history)
-            self.db.commit()
+            self.db.flush()
             return history
     
     def save_query(self, user_id: int, query_id: int, name: str) -> Optional[QueryHistory]:
@@ -3,27 +3,43 @@ Authentication Service
 """
 from datetime import datetime, timedelta
 from typing import Optional
-from jose import jwt, JWTError
-from sqlalchemy.orm import Session
+import hashlib
+import time
+import jwt
+from sqlalchemy import update
+from sqlalchemy.orm import Session, selectinload
 
 from app.config import settings
-from app.models import User, RefreshToken
+from app.models import User, Role, RefreshToken
 from app.schemas import Token, TokenPayload
 
+# Signing key encoded and algorithm list built once rather than per token
+_SIGNING_KEY = settings.SECRET_KEY.encode() if isinstance(settings.SECRET_KEY, str) else settings.SECRET_KEY
+_ALGORITHMS = [settings.ALGORITHM]
+ACCESS_TOKEN_EXPIRE_SECONDS = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+# Permission checks walk roles and their permissions; load both up front
+# with one IN query each instead of lazily per role
+_USER_PERMISSIONS_LOAD = selectinload(User.roles).selectinload(Role.permissions)
+
+
+def hash_refresh_token(token: str) -> bytes:
+    """SHA-256 digest of a refresh token, used as its indexed lookup key."""
+    return hashlib.sha256(token.encode()).digest()
+
 
 def create_access_token(user: User) -> str:
     """Create JWT access token."""
-    expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     payload = {
         "sub": str(user.id),
         "email": user.email,
-        "exp": expire,
+        "exp": int(time.time()) + ACCESS_TOKEN_EXPIRE_SECONDS,
         "type": "access"
     }
-    return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    return jwt.encode(payload, _SIGNING_KEY, algorithm=settings.ALGORITHM)
 
 
-def create_refresh_token(user: User, db: Session) -> str:
+def create_refresh_token(user: User, db: Session, commit: bool = True) -> str:
     """Create JWT refresh token and store in database."""
     expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
     payload = {
@@ -32,34 +48,36 @@ def create_refresh_token(user: User, db: Session) -> str:
         "exp": expire,
         "type": "refresh"
     }
-    token = jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    token = jwt.encode(payload, _SIGNING_KEY, algorithm=settings.ALGORITHM)
     
     # Store refresh token
     db_token = RefreshToken(
         user_id=user.id,
         token=token,
+        token_hash=hash_refresh_token(token),
         expires_at=expire
     )
     db.add(db_token)
-    db.commit()
+    if commit:
+        db.commit()
     
     return token
 
 
-def create_tokens(user: User, db: Session) -> Token:
+def create_tokens(user: User, db: Session, commit: bool = True) -> Token:
     """Create both access and refresh tokens."""
     return Token(
         access_token=create_access_token(user),
-        refresh_token=create_refresh_token(user, db),
+        refresh_token=create_refresh_token(user, db, commit=commit),
         token_type="bearer",
-        expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        expires_in=ACCESS_TOKEN_EXPIRE_SECONDS
     )
 
 
 def verify_token(token: str, token_type: str = "access") -> Optional[TokenPayload]:
     """Verify JWT token and return payload."""
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = jwt.decode(token, _SIGNING_KEY, algorithms=_ALGORITHMS)
         if payload.get("type") != token_type:
             return None
         return TokenPayload(
@@ -68,7 +86,7 @@ def verify_token(token: str, token_type: str = "access") -> Optional[TokenPayloa
             exp=datetime.fromtimestamp(payload["exp"]),
             type=payload["type"]
         )
-    except JWTError:
+    except jwt.InvalidTokenError:
         return None
 
 
@@ -89,31 +107,42 @@ def refresh_access_token(db: Session, refresh_token: str) -> Optional[Token]:
     if not payload:
         return None
     
-    # Check if token is in database and not revoked
-    db_token = db.query(RefreshToken).filter(
-        RefreshToken.token == refresh_token,
-        RefreshToken.revoked == False
+    # Revoke the token if it is in database and not revoked; only one
+    # concurrent refresh can win this UPDATE
+    db_token = db.execute(
+        update(RefreshToken)
+        .where(
+            RefreshToken.token_hash == hash_refresh_token(refresh_token),
+            RefreshToken.revoked == False
+        )
+        .values(revoked=True)
+        .returning(RefreshToken.user_id, RefreshToken.expires_at)
     ).first()
     
-    if not db_token or db_token.expires_at < datetime.utcnow():
+    if not db_token:
+        return None
+    
+    if db_token.expires_at < datetime.utcnow():
+        db.rollback()
         return None
     
     # Get user
-    user = db.query(User).filter(User.id == payload.sub).first()
+    user = db.query(User).filter(User.id == db_token.user_id).first()
     if not user or not user.is_active:
+        db.rollback()
         return None
     
-    # Revoke old refresh token
-    db_token.revoked = True
+    # Create new tokens; revocation and the new token commit together
+    tokens = create_tokens(user, db, commit=False)
     db.commit()
-    
-    # Create new tokens
-    return create_tokens(user, db)
+    return tokens
 
 
 def revoke_refresh_token(db: Session, token: str) -> bool:
     """Revoke a refresh token."""
-    db_token = db.query(RefreshToken).filter(RefreshToken.token == token).first()
+    db_token = db.query(RefreshToken).filter(
+        RefreshToken.token_hash == hash_refresh_token(token)
+    ).first()
     if db_token:
         db_token.revoked = True
         db.commit()
@@ -121,9 +150,20 @@ def revoke_refresh_token(db: Session, token: str) -> bool:
     return False
 
 
-def get_user_by_id(db: Session, user_id: int) -> Optional[User]:
-    """Get user by ID."""
-    return db.query(User).filter(User.id == user_id).first()
+def get_user_by_id(db: Session, user_id: int, load_permissions: bool = True) -> Optional[User]:
+    """
+    Get user by ID.
+    
+    Args:
+        db: Database session
+        user_id: User ID
+        load_permissions: Also load roles and their permissions for
+            permission checks; skip when they are already known
+    """
+    query = db.query(User)
+    if load_permissions:
+        query = query.options(_USER_PERMISSIONS_LOAD)
+    return query.filter(User.id == user_id).first()
 
 
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
@@ -27,13 +27,17 @@ def get_or_create_encryption_key() -> bytes:
 # Initialize Fernet cipher
 _cipher = Fernet(get_or_create_encryption_key())
 
+# Every Fernet token starts with this (version byte 0x80 plus the high
+# timestamp bytes); values stored with an extra base64 layer never do
+_FERNET_TOKEN_PREFIX = "gAAAAA"
+
 
 def encrypt_value(value: str) -> str:
     """Encrypt a string value."""
     if not value:
         return ""
-    encrypted = _cipher.encrypt(value.encode())
-    return base64.b64encode(encrypted).decode()
+    # Fernet tokens are already URL-safe base64
+    return _cipher.encrypt(value.encode()).decode("ascii")
 
 
 def decrypt_value(encrypted_value: str) -> Optional[str]:
@@ -41,9 +45,11 @@ def decrypt_value(encrypted_value: str) -> Optional[str]:
     if not encrypted_value:
         return None
     try:
-        decoded = base64.b64decode(encrypted_value.encode())
-        decrypted = _cipher.decrypt(decoded)
-        return decrypted.decode()
+        token = encrypted_value.encode("ascii")
+        if not encrypted_value.startswith(_FERNET_TOKEN_PREFIX):
+            # Legacy value, base64-encoded around the Fernet token
+            token = base64.b64decode(token)
+        return _cipher.decrypt(token).decode()
     except Exception:
         return None
 
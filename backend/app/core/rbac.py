@@ -1,19 +1,71 @@
 """
 Role-Based Access Control (RBAC) Service
 """
-from functools import wraps
-from typing import List, Optional, Callable
+from functools import lru_cache, wraps
+from typing import Dict, FrozenSet, Iterable, List, Optional, Callable, Set, Tuple
+import threading
+import time
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import exists, lambda_stmt, or_, select, true, tuple_
+from sqlalchemy.orm import Session, selectinload
 
 from app.database import get_db
 from app.models import User, Role, Permission, Dataset, DatasetPermission
+from app.models.user import role_permissions, user_roles
 from app.core.auth import verify_token, get_user_by_id
+from app.core.audit import UPSERT_INSERTS
 
 security = HTTPBearer()
 
 
+class PermissionCache:
+    """
+    Process-wide, short-lived cache of each user's resolved permission names.
+    
+    Lets get_current_user skip loading roles and permissions for users seen
+    in the last few seconds. Role changes to a user are applied at once via
+    invalidate(); permission changes to a role apply within TTL_SECONDS.
+    """
+    
+    # Seconds a resolved permission set is reused
+    TTL_SECONDS = 10
+    # Users cached at once; the oldest entry is dropped beyond this
+    MAX_ENTRIES = 10000
+    
+    def __init__(self):
+        # user_id -> (resolved_at, permission names), in insertion order
+        self._entries: Dict[int, Tuple[float, FrozenSet[str]]] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, user_id: int) -> Optional[FrozenSet[str]]:
+        """Get a user's permission names, or None if missing or expired."""
+        entry = self._entries.get(user_id)
+        if entry is None or time.monotonic() - entry[0] >= self.TTL_SECONDS:
+            return None
+        return entry[1]
+    
+    def set(self, user_id: int, permission_names: FrozenSet[str]) -> None:
+        """Store a user's freshly resolved permission names."""
+        with self._lock:
+            self._entries.pop(user_id, None)
+            if len(self._entries) >= self.MAX_ENTRIES:
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[user_id] = (time.monotonic(), permission_names)
+    
+    def invalidate(self, user_id: Optional[int] = None) -> None:
+        """Forget one user's permissions, or everyone's when user_id is None."""
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+
+
+# Global permission cache instance
+permission_cache = PermissionCache()
+
+
 class PermissionDeniedError(HTTPException):
     """Permission denied exception."""
     def __init__(self, detail: str = "Permission denied"):
@@ -37,25 +89,23 @@ async def get_current_user(
     if not payload:
         raise UnauthorizedError("Invalid or expired token")
     
-    user = get_user_by_id(db, payload.sub)
+    # Roles and permissions are only loaded when not cached
+    permission_names = permission_cache.get(payload.sub)
+    user = get_user_by_id(db, payload.sub, load_permissions=permission_names is None)
     if not user:
         raise UnauthorizedError("User not found")
     
     if not user.is_active:
         raise UnauthorizedError("User account is disabled")
     
+    if permission_names is None:
+        permission_cache.set(user.id, user.permission_names)
+    else:
+        user.permission_names = permission_names
+    
     return user
 
 
-async def get_current_active_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
-    """Ensure current user is active."""
-    if not current_user.is_active:
-        raise PermissionDeniedError("Inactive user")
-    return current_user
-
-
 async def get_current_superuser(
     current_user: User = Depends(get_current_user)
 ) -> User:
@@ -65,30 +115,61 @@ async def get_current_superuser(
     return current_user
 
 
+@lru_cache(maxsize=1024)
+def permission_mask(permission_names: FrozenSet[str]) -> int:
+    """
+    Fold permission names into a PERMISSION_BITS mask; unknown names are ignored.
+    
+    Cached per set: cached users share one frozenset, whose hash Python
+    stores, so repeat lookups cost a dict probe.
+    """
+    mask = 0
+    for name in permission_names:
+        mask |= PERMISSION_BITS.get(name, 0)
+    return mask
+
+
+def required_mask(permission_names: List[str]) -> Optional[int]:
+    """Mask for required permissions, or None if any has no bit assigned."""
+    if not all(name in PERMISSION_BITS for name in permission_names):
+        return None
+    return permission_mask(frozenset(permission_names))
+
+
 def require_permission(permission_name: str):
     """Decorator to require a specific permission."""
-    def decorator(func: Callable):
-        @wraps(func)
-        async def wrapper(*args, current_user: User = Depends(get_current_user), **kwargs):
-            if not current_user.has_permission(permission_name):
-                raise PermissionDeniedError(f"Permission '{permission_name}' required")
-            return await func(*args, current_user=current_user, **kwargs)
-        return wrapper
-    return decorator
+    return require_permissions([permission_name], require_all=True)
 
 
 def require_permissions(permission_names: List[str], require_all: bool = True):
     """Decorator to require multiple permissions."""
     def decorator(func: Callable):
+        # Resolved once per decorated endpoint, not per request
+        names = frozenset(permission_names)
+        required = required_mask(permission_names)
+        if require_all:
+            denied = {perm: f"Permission '{perm}' required" for perm in permission_names}
+        else:
+            denied_any = f"One of permissions {permission_names} required"
+        
+        def check(granted: FrozenSet[str]) -> None:
+            if required is not None:
+                held = permission_mask(granted) & required
+                allowed = held == required if require_all else held != 0
+            else:
+                allowed = names <= granted if require_all else not names.isdisjoint(granted)
+            if allowed:
+                return
+            
+            if require_all:
+                missing = next(perm for perm in permission_names if perm not in granted)
+                raise PermissionDeniedError(denied[missing])
+            raise PermissionDeniedError(denied_any)
+        
         @wraps(func)
         async def wrapper(*args, current_user: User = Depends(get_current_user), **kwargs):
-            if require_all:
-                for perm in permission_names:
-                    if not current_user.has_permission(perm):
-                        raise PermissionDeniedError(f"Permission '{perm}' required")
-            else:
-                if not any(current_user.has_permission(perm) for perm in permission_names):
-                    raise PermissionDeniedError(f"One of permissions {permission_names} required")
+            if not current_user.is_superuser:
+                check(current_user.permission_names)
             return await func(*args, current_user=current_user, **kwargs)
         return wrapper
     return decorator
@@ -97,6 +178,64 @@ def require_permissions(permission_names: List[str], require_all: bool = True):
 class DatasetAccessChecker:
     """Check user access to datasets."""
     
+    @staticmethod
+    def _has_grant(db: Session, user: User, dataset: Dataset, flag, include_roles: bool = False) -> bool:
+        """
+        Check for a DatasetPermission row granting flag, in one EXISTS query.
+        
+        With include_roles, grants to any of the user's roles count too; the
+        role ids come from a user_roles subquery, so user.roles isn't loaded.
+        The statements are lambdas so their compiled SQL is cached, with the
+        ids bound as parameters.
+        """
+        dataset_id, user_id = dataset.id, user.id
+        if include_roles:
+            stmt = lambda_stmt(lambda: select(exists().where(
+                DatasetPermission.dataset_id == dataset_id,
+                flag == True,
+                or_(
+                    DatasetPermission.user_id == user_id,
+                    DatasetPermission.role_id.in_(
+                        select(user_roles.c.role_id).where(user_roles.c.user_id == user_id)
+                    )
+                )
+            )))
+        else:
+            stmt = lambda_stmt(lambda: select(exists().where(
+                DatasetPermission.dataset_id == dataset_id,
+                flag == True,
+                DatasetPermission.user_id == user_id
+            )))
+        return db.execute(stmt).scalar()
+    
+    @staticmethod
+    def filter_readable(db: Session, user: User, dataset_ids: Iterable[int]) -> Set[int]:
+        """
+        Get which of dataset_ids the user can read, in two queries.
+        
+        Same rules as can_read. Superusers get every id back without a query,
+        so callers still need to handle ids of missing datasets.
+        """
+        dataset_ids = set(dataset_ids)
+        if user.is_superuser or not dataset_ids:
+            return dataset_ids
+        
+        visible = db.query(Dataset.id).filter(
+            Dataset.id.in_(dataset_ids),
+            or_(Dataset.owner_id == user.id, Dataset.is_public == True)
+        )
+        granted = db.query(DatasetPermission.dataset_id).filter(
+            DatasetPermission.dataset_id.in_(dataset_ids),
+            DatasetPermission.can_read == True,
+            or_(
+                DatasetPermission.user_id == user.id,
+                DatasetPermission.role_id.in_(
+                    select(user_roles.c.role_id).where(user_roles.c.user_id == user.id)
+                )
+            )
+        )
+        return {dataset_id for (dataset_id,) in visible} | {dataset_id for (dataset_id,) in granted}
+    
     @staticmethod
     def can_read(db: Session, user: User, dataset: Dataset) -> bool:
         """Check if user can read dataset."""
@@ -107,27 +246,10 @@ class DatasetAccessChecker:
         if dataset.is_public:
             return True
         
-        # Check explicit permissions
-        perm = db.query(DatasetPermission).filter(
-            DatasetPermission.dataset_id == dataset.id,
-            DatasetPermission.user_id == user.id,
-            DatasetPermission.can_read == True
-        ).first()
-        
-        if perm:
-            return True
-        
-        # Check role-based permissions
-        for role in user.roles:
-            perm = db.query(DatasetPermission).filter(
-                DatasetPermission.dataset_id == dataset.id,
-                DatasetPermission.role_id == role.id,
-                DatasetPermission.can_read == True
-            ).first()
-            if perm:
-                return True
-        
-        return False
+        # Check explicit and role-based permissions
+        return DatasetAccessChecker._has_grant(
+            db, user, dataset, DatasetPermission.can_read, include_roles=True
+        )
     
     @staticmethod
     def can_write(db: Session, user: User, dataset: Dataset) -> bool:
@@ -139,13 +261,7 @@ class DatasetAccessChecker:
         if dataset.is_locked:
             return False
         
-        perm = db.query(DatasetPermission).filter(
-            DatasetPermission.dataset_id == dataset.id,
-            DatasetPermission.user_id == user.id,
-            DatasetPermission.can_write == True
-        ).first()
-        
-        return perm is not None
+        return DatasetAccessChecker._has_grant(db, user, dataset, DatasetPermission.can_write)
     
     @staticmethod
     def can_delete(db: Session, user: User, dataset: Dataset) -> bool:
@@ -155,13 +271,7 @@ class DatasetAccessChecker:
         if dataset.owner_id == user.id:
             return True
         
-        perm = db.query(DatasetPermission).filter(
-            DatasetPermission.dataset_id == dataset.id,
-            DatasetPermission.user_id == user.id,
-            DatasetPermission.can_delete == True
-        ).first()
-        
-        return perm is not None
+        return DatasetAccessChecker._has_grant(db, user, dataset, DatasetPermission.can_delete)
     
     @staticmethod
     def get_visible_columns(db: Session, user: User, dataset: Dataset) -> Optional[List[str]]:
@@ -169,13 +279,16 @@ class DatasetAccessChecker:
         if user.is_superuser or dataset.owner_id == user.id:
             return None
         
-        perm = db.query(DatasetPermission).filter(
-            DatasetPermission.dataset_id == dataset.id,
-            DatasetPermission.user_id == user.id
-        ).first()
+        dataset_id, user_id = dataset.id, user.id
+        visible_columns = db.execute(lambda_stmt(
+            lambda: select(DatasetPermission.visible_columns).where(
+                DatasetPermission.dataset_id == dataset_id,
+                DatasetPermission.user_id == user_id
+            ).limit(1)
+        )).scalar()
         
-        if perm and perm.visible_columns:
-            return perm.visible_columns
+        if visible_columns:
+            return visible_columns
         
         return None
 
@@ -211,6 +324,11 @@ DEFAULT_PERMISSIONS = [
     {"name": "admin:jobs", "resource": "admin", "action": "jobs", "description": "Manage jobs"},
 ]
 
+# One bit per default permission, for single-AND checks in the decorators
+PERMISSION_BITS: Dict[str, int] = {
+    perm["name"]: 1 << index for index, perm in enumerate(DEFAULT_PERMISSIONS)
+}
+
 DEFAULT_ROLES = [
     {
         "name": "admin",
@@ -247,20 +365,77 @@ DEFAULT_ROLES = [
 
 
 def initialize_rbac(db: Session):
-    """Initialize default roles and permissions."""
+    """
+    Initialize default roles and permissions.
+    
+    Seeds with three idempotent INSERTs: permissions and roles skip names
+    that exist, and role grants insert only missing pairs, so existing
+    roles still pick up newly added default permissions.
+    """
+    insert = UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if insert is None:
+        return _initialize_rbac_fallback(db)
+    
+    db.execute(
+        insert(Permission).values(DEFAULT_PERMISSIONS)
+        .on_conflict_do_nothing(index_elements=["name"])
+    )
+    db.execute(
+        insert(Role).values([
+            {key: value for key, value in role_data.items() if key != "permissions"}
+            for role_data in DEFAULT_ROLES
+        ]).on_conflict_do_nothing(index_elements=["name"])
+    )
+    
+    grants = [
+        (role_data["name"], perm_name)
+        for role_data in DEFAULT_ROLES
+        for perm_name in role_data["permissions"]
+    ]
+    # Explicit cross join: the IN over (role, permission) pairs is what
+    # narrows it, which the linter can't see in a bare two-table FROM
+    missing = (
+        select(Role.id, Permission.id)
+        .select_from(Role)
+        .join(Permission, true())
+        .where(
+            tuple_(Role.name, Permission.name).in_(grants),
+            ~exists().where(
+                role_permissions.c.role_id == Role.id,
+                role_permissions.c.permission_id == Permission.id
+            )
+        )
+    )
+    db.execute(
+        role_permissions.insert().from_select(["role_id", "permission_id"], missing)
+    )
+    
+    db.commit()
+
+
+def _initialize_rbac_fallback(db: Session):
+    """Seed roles and permissions with ORM queries, for dialects without ON CONFLICT."""
     # Create permissions
-    for perm_data in DEFAULT_PERMISSIONS:
-        existing = db.query(Permission).filter(Permission.name == perm_data["name"]).first()
-        if not existing:
-            perm = Permission(**perm_data)
-            db.add(perm)
+    existing_perm_names = {name for (name,) in db.query(Permission.name).all()}
+    db.bulk_save_objects([
+        Permission(**perm_data) for perm_data in DEFAULT_PERMISSIONS
+        if perm_data["name"] not in existing_perm_names
+    ])
     
     db.commit()
     
-    # Create roles with permissions
+    # Load everything the role loop needs up front instead of per permission
+    perms_by_name = {perm.name: perm for perm in db.query(Permission).all()}
+    roles_by_name = {
+        role.name: role
+        for role in db.query(Role).options(selectinload(Role.permissions)).filter(
+            Role.name.in_([role_data["name"] for role_data in DEFAULT_ROLES])
+        ).all()
+    }
+    
     # Create or update roles with permissions
     for role_data in DEFAULT_ROLES:
-        role = db.query(Role).filter(Role.name == role_data["name"]).first()
+        role = roles_by_name.get(role_data["name"])
         if not role:
             role = Role(
                 name=role_data["name"],
@@ -268,14 +443,12 @@ def initialize_rbac(db: Session):
                 is_system=role_data["is_system"]
             )
             db.add(role)
-            db.flush()  # Get ID
 
         # Update permissions
         current_perms = {p.name for p in role.permissions}
-        for perm_name in role_data["permissions"]:
-            if perm_name not in current_perms:
-                perm = db.query(Permission).filter(Permission.name == perm_name).first()
-                if perm:
-                    role.permissions.append(perm)
+        role.permissions.extend(
+            perms_by_name[perm_name] for perm_name in role_data["permissions"]
+            if perm_name not in current_perms and perm_name in perms_by_name
+        )
         
     db.commit()
@@ -2,12 +2,16 @@
 Database connection and session management - DUAL DATABASE ARCHITECTURE
 """
 from sqlalchemy import create_engine, inspect
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
+from collections import OrderedDict
 from contextlib import contextmanager
-from typing import Generator, Optional
+from typing import Dict, Generator, Optional, Tuple
 import duckdb
 import os
+import threading
+import time
 
 from app.config import settings
 
@@ -19,25 +23,17 @@ from app.config import settings
 # ============================================================================
 
 # App DB Engine - Connects to AI_Data_Management
-try:
-    app_engine = create_engine(
-        settings.DATABASE_URL,  # Directly from env, no dynamic config
-        pool_size=20,
-        max_overflow=30,
-        pool_pre_ping=True,
-        echo=settings.DEBUG,
-        connect_args={'connect_timeout': 10}
-    )
-except Exception:
-    # If initial connection fails, create engine anyway
-    app_engine = create_engine(
-        settings.DATABASE_URL,
-        pool_size=20,
-        max_overflow=30,
-        pool_pre_ping=True,
-        echo=settings.DEBUG,
-        connect_args={'connect_timeout': 10}
-    )
+# create_engine is lazy: nothing connects until the first checkout
+app_engine = create_engine(
+    settings.DATABASE_URL,  # Directly from env, no dynamic config
+    pool_size=20,
+    max_overflow=30,
+    pool_pre_ping=settings.APP_DB_POOL_PRE_PING,
+    pool_recycle=settings.APP_DB_POOL_RECYCLE,
+    pool_use_lifo=True,  # Reuse the warmest connection
+    echo=settings.SQL_ECHO,
+    connect_args={'connect_timeout': 10}
+)
 
 AppSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=app_engine)
 
@@ -45,10 +41,22 @@ Base = declarative_base()
 
 
 def get_app_db() -> Generator[Session, None, None]:
-    """Dependency for App DB session (internal operations)."""
+    """
+    Dependency for App DB session (internal operations).
+    
+    Commits once when the handler returns, so writes it only staged (e.g.
+    audit entries) land together with the request's own work; rolls back
+    if the handler raises. Best-effort writes whose errors the handler
+    swallows belong in db.begin_nested(), so a failed statement can't
+    leave the session unable to commit.
+    """
     db = AppSessionLocal()
     try:
         yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
     finally:
         db.close()
 
@@ -77,8 +85,17 @@ def get_app_db_context() -> Generator[Session, None, None]:
 class UserDatabaseManager:
     """Manager for User Operational Database connections."""
     
+    # Distinct (connection string, read-only) engines kept pooled at once
+    MAX_ENGINES = 8
+    # Seconds a resolved profile (connection string, read-only) is reused
+    PROFILE_TTL_SECONDS = 30
+    
     def __init__(self):
-        self._active_connection = None
+        # (connection_string, read_only) -> Engine, least recently used first
+        self._engines: OrderedDict[Tuple[str, bool], Engine] = OrderedDict()
+        self._engines_lock = threading.Lock()
+        # connection_id (None = any active) -> (resolved_at, connection_string, read_only)
+        self._profiles: Dict[Optional[int], Tuple[float, str, bool]] = {}
     
     def get_active_connection_profile(self, app_db: Session, connection_id: Optional[int] = None):
         """Get the active connection profile from App DB."""
@@ -105,20 +122,50 @@ class UserDatabaseManager:
             pool_size=5,
             max_overflow=10,
             pool_pre_ping=True,
-            echo=settings.DEBUG,
+            echo=settings.SQL_ECHO,
             connect_args=connect_args
         )
     
-    @contextmanager
-    def get_connection(self, app_db: Session, connection_id: Optional[int] = None):
+    def _get_or_create_engine(self, connection_string: str, read_only: bool = False):
+        """Get the pooled engine for a connection string, disposing the LRU one past MAX_ENGINES."""
+        key = (connection_string, read_only)
+        evicted = None
+        with self._engines_lock:
+            engine = self._engines.get(key)
+            if engine is not None:
+                self._engines.move_to_end(key)
+                return engine
+            
+            engine = self._engines[key] = self.create_engine(connection_string, read_only)
+            if len(self._engines) > self.MAX_ENGINES:
+                _, evicted = self._engines.popitem(last=False)
+        
+        if evicted is not None:
+            evicted.dispose()
+        return engine
+    
+    def invalidate(self) -> None:
+        """Drop resolved profiles and dispose cached engines, e.g. after a profile changes."""
+        with self._engines_lock:
+            self._profiles.clear()
+            engines = list(self._engines.values())
+            self._engines.clear()
+        for engine in engines:
+            engine.dispose()
+    
+    def _resolve_profile(self, app_db: Session, connection_id: Optional[int] = None) -> Tuple[str, bool]:
         """
-        Get a connection to the User Operational Database.
+        Get the connection string and read-only flag for the active profile.
         
-        CRITICAL: This connection is ONLY for user data operations.
-        It MUST NOT be used to access App DB tables.
+        Reused for PROFILE_TTL_SECONDS, which saves the App DB query and the
+        password decrypt on every request; invalidate() drops it at once.
         """
         from app.core.crypto import decrypt_value
         
+        entry = self._profiles.get(connection_id)
+        if entry is not None and time.monotonic() - entry[0] < self.PROFILE_TTL_SECONDS:
+            return entry[1], entry[2]
+        
         profile = self.get_active_connection_profile(app_db, connection_id)
         
         if not profile:
@@ -133,8 +180,21 @@ class UserDatabaseManager:
         # Generate connection string
         connection_string = profile.get_connection_string(decrypted_password)
         
-        # Create ephemeral engine
-        engine = self.create_engine(connection_string, profile.is_read_only)
+        self._profiles[connection_id] = (time.monotonic(), connection_string, profile.is_read_only)
+        return connection_string, profile.is_read_only
+    
+    @contextmanager
+    def get_connection(self, app_db: Session, connection_id: Optional[int] = None):
+        """
+        Get a connection to the User Operational Database.
+        
+        CRITICAL: This connection is ONLY for user data operations.
+        It MUST NOT be used to access App DB tables.
+        """
+        connection_string, read_only = self._resolve_profile(app_db, connection_id)
+        
+        # Reuse the pooled engine for this connection string
+        engine = self._get_or_create_engine(connection_string, read_only)
         
         connection = None
         try:
@@ -143,7 +203,6 @@ class UserDatabaseManager:
         finally:
             if connection:
                 connection.close()
-            engine.dispose()
 
 
 # Global User DB Manager
@@ -170,7 +229,14 @@ def get_user_db(app_db: Session = None):
 # ============================================================================
 
 class DuckDBManager:
-    """Manager for DuckDB analytics database."""
+    """
+    Manager for DuckDB analytics database.
+    
+    Queries run on a per-thread cursor of the one shared connection, so
+    threads don't serialize on the connection lock. Cursors share the
+    database file but not registered DataFrames, so registrations are kept
+    here and replayed onto each cursor when they change.
+    """
     
     _instance = None
     _connection = None
@@ -184,16 +250,41 @@ class DuckDBManager:
         if self._connection is None:
             os.makedirs(os.path.dirname(settings.DUCKDB_PATH), exist_ok=True)
             self._connection = duckdb.connect(settings.DUCKDB_PATH)
+            self._local = threading.local()
+            self._lock = threading.Lock()
+            # name -> DataFrame; bumped generation tells cursors to resync
+            self._frames = {}
+            self._generation = 0
     
     @property
     def connection(self):
         return self._connection
     
+    def _cursor(self):
+        """Get this thread's cursor, with current DataFrame registrations."""
+        local = self._local
+        cursor = getattr(local, "cursor", None)
+        if cursor is None:
+            cursor = local.cursor = self._connection.cursor()
+            local.frames = {}
+            local.generation = -1
+        
+        if local.generation != self._generation:
+            with self._lock:
+                frames = dict(self._frames)
+                generation = self._generation
+            for name in local.frames.keys() - frames.keys():
+                cursor.unregister(name)
+            for name, df in frames.items():
+                if local.frames.get(name) is not df:
+                    cursor.register(name, df)
+            local.frames = frames
+            local.generation = generation
+        return cursor
+    
     def execute(self, query: str, params: list = None):
         """Execute a query and return results."""
-        if params:
-            return self._connection.execute(query, params)
-        return self._connection.execute(query)
+        return self._cursor().execute(query, params or [])
     
     def query_df(self, query: str, params: list = None):
         """Execute query and return pandas DataFrame."""
@@ -202,11 +293,17 @@ class DuckDBManager:
     
     def register_dataframe(self, name: str, df):
         """Register a pandas DataFrame as a virtual table."""
-        self._connection.register(name, df)
+        with self._lock:
+            self._connection.register(name, df)
+            self._frames[name] = df
+            self._generation += 1
     
     def unregister(self, name: str):
         """Unregister a virtual table."""
-        self._connection.unregister(name)
+        with self._lock:
+            self._connection.unregister(name)
+            self._frames.pop(name, None)
+            self._generation += 1
     
     def close(self):
         """Close the connection."""
@@ -13,6 +13,7 @@ from app.config import settings
 from app.database import Base, app_engine
 from app.core.rbac import initialize_rbac
 from app.database import get_app_db_context
+from app.models.partitioning import ensure_monthly_partitions
 
 # Configure structured logging
 structlog.configure(
@@ -23,6 +24,9 @@ structlog.configure(
     ],
     wrapper_class=structlog.stdlib.BoundLogger,
     logger_factory=structlog.stdlib.LoggerFactory(),
+    # Module-level loggers are lazy proxies that rebuild their bound logger
+    # on every call unless cached; audit logging runs on each request
+    cache_logger_on_first_use=True,
 )
 
 logger = structlog.get_logger()
@@ -41,6 +45,9 @@ async def lifespan(app: FastAPI):
         # Initialize RBAC (roles and permissions)
         with get_app_db_context() as db:
             initialize_rbac(db)
+        
+        # Pre-create monthly log partitions; later rows fall into DEFAULT
+        ensure_monthly_partitions(app_engine, months_ahead=12)
         logger.info("database_initialized")
     except Exception as e:
         logger.warning("database_init_failed", error=str(e))
@@ -75,11 +82,10 @@ app.add_middleware(
 # Request timing middleware
 @app.middleware("http")
 async def add_process_time_header(request: Request, call_next):
-    """Add request timing to response headers."""
-    start_time = time.time()
+    """Add request timing to response headers, in milliseconds."""
+    start_ns = time.perf_counter_ns()
     response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
+    response.headers["X-Process-Time"] = f"{(time.perf_counter_ns() - start_ns) / 1e6:.2f}ms"
     return response
 
 
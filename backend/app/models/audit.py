@@ -1,12 +1,14 @@
 """
 Audit Log Model
 """
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, JSON, Boolean, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean, Index, text, Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
 
 from app.database import Base
+from app.models.partitioning import partition_by_month
 
 
 class AuditActionType(str, enum.Enum):
@@ -57,27 +59,35 @@ class AuditLog(Base):
     """Audit log for tracking all operations."""
     __tablename__ = "audit_logs"
 
-    id = Column(Integer, primary_key=True, index=True)
+    # Table key is (id, created_at), as partitioning requires; rows are
+    # still identified by id alone
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     
     # Actor
-    user_id = Column(Integer, ForeignKey('users.id', ondelete='SET NULL'), index=True)
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='SET NULL'))
     user_email = Column(String(255))  # Denormalized for historical tracking
     ip_address = Column(String(50))
     user_agent = Column(String(500))
     
     # Connection context
-    connection_id = Column(Integer, ForeignKey('connection_profiles.id', ondelete='SET NULL'), nullable=True, index=True)
+    connection_id = Column(Integer, ForeignKey('connection_profiles.id', ondelete='SET NULL'), nullable=True)
     connection_name = Column(String(255))  # Denormalized
     
     # Action
-    action = Column(String(100), nullable=False, index=True)  # For backward compatibility
-    action_type = Column(SQLEnum(AuditActionType), nullable=True, index=True)  # New structured field
-    resource_type = Column(String(100), index=True)  # 'dataset', 'user', 'query', 'connection', etc.
+    action = Column(String(100), nullable=False)  # For backward compatibility
+    # Stored as a CHECK-constrained string rather than a native enum type, so
+    # adding an action is a transactional constraint swap, not ALTER TYPE
+    action_type = Column(
+        SQLEnum(AuditActionType, native_enum=False, create_constraint=True, length=50, name='ck_audit_logs_action_type'),
+        nullable=True,
+        index=True
+    )  # New structured field
+    resource_type = Column(String(100))  # 'dataset', 'user', 'query', 'connection', etc.
     resource_id = Column(String(100))
     resource_name = Column(String(255))
     
     # Details
-    details = Column(JSON)
+    details = Column(JSONB)
     query_text = Column(Text)  # For SQL queries
     
     # Status
@@ -89,11 +99,25 @@ class AuditLog(Base):
     rows_affected = Column(Integer)
     
     # Timestamp
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), primary_key=True, index=True)
     
     # Relationships
-    user = relationship("User", back_populates="audit_logs")
-    connection = relationship("ConnectionProfile", foreign_keys=[connection_id])
+    user = relationship("User", back_populates="audit_logs", lazy="raise")
+    connection = relationship("ConnectionProfile", foreign_keys=[connection_id], lazy="raise")
+    
+    # Audit trails filter by actor, resource or connection and list newest first;
+    # each composite also serves lookups on its leading column alone
+    __table_args__ = (
+        Index('ix_audit_user_created', 'user_id', 'created_at'),
+        Index('ix_audit_resource', 'resource_type', 'resource_id'),
+        Index('ix_audit_conn_action_created', 'connection_id', 'action_type', 'created_at'),
+        Index('ix_audit_failures', 'created_at', postgresql_where=text("status = 'failure'")),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
+    )
+    __mapper_args__ = {'primary_key': [id]}
+
+
+partition_by_month(AuditLog.__table__, 'created_at')
 
 
 class QueryHistory(Base):
@@ -106,7 +130,7 @@ class QueryHistory(Base):
     # Query info
     name = Column(String(255))
     query_text = Column(Text, nullable=False)
-    query_hash = Column(String(64), index=True)  # For deduplication
+    query_hash = Column(String(32))  # Truncated SHA-256, for deduplication via uq_query_history_user_hash
     
     # Execution stats
     execution_count = Column(Integer, default=1)
@@ -119,6 +143,11 @@ class QueryHistory(Base):
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    # One row per (user, query); record_query upserts against this index
+    __table_args__ = (
+        Index('uq_query_history_user_hash', 'user_id', 'query_hash', unique=True),
+    )
+
 
 class TableEntryAudit(Base):
     """Audit log for table entry operations."""
@@ -133,10 +162,15 @@ class TableEntryAudit(Base):
     rows_inserted = Column(Integer, nullable=False, default=0)
     rows_failed = Column(Integer, nullable=False, default=0)
     insert_mode = Column(String(50), nullable=False)  # transaction, row-by-row
-    error_details = Column(JSON)  # List of error details for failed rows
+    error_details = Column(JSONB)  # List of error details for failed rows
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
     # Relationships
-    user = relationship("User")
-    connection = relationship("ConnectionProfile")
+    user = relationship("User", lazy="raise")
+    connection = relationship("ConnectionProfile", lazy="raise")
+    
+    # Entry history is listed per connection, newest first
+    __table_args__ = (
+        Index('ix_table_entry_audit_connection_created', 'connection_id', 'created_at'),
+    )
 
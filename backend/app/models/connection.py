@@ -1,7 +1,9 @@
 """
 Connection Profile Model - Stores User Operational Database configurations
 """
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, JSON, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Index, Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
 import enum
@@ -79,8 +81,8 @@ class ConnectionProfile(Base):
     failed_attempts = Column(Integer, default=0, nullable=False)
     
     # Database Capabilities (auto-detected)
-    capabilities = Column(JSON, nullable=True)  # {version, features, extensions}
-    db_metadata = Column(JSON, nullable=True)  # Additional DB-specific metadata (renamed from metadata)
+    capabilities = Column(JSONB, nullable=True)  # {version, features, extensions}
+    db_metadata = Column(JSONB, nullable=True)  # Additional DB-specific metadata (renamed from metadata)
     
     # Settings
     is_active = Column(Boolean, default=False, nullable=False)
@@ -99,6 +101,17 @@ class ConnectionProfile(Base):
     encryption_key_version = Column(Integer, default=1, nullable=False)  # Track which key was used
     encrypted_connection_string = Column(Text, nullable=True)  # Store full connection URI if provided
     
+    # Relationships; both tables cascade on delete in the database, so
+    # deleting a profile doesn't load its history or grants first
+    health_logs = relationship("ConnectionHealthLog", back_populates="connection", lazy="raise", passive_deletes=True)
+    permissions = relationship("ConnectionPermission", back_populates="connection", lazy="raise", passive_deletes=True)
+    
+    # Active profiles are looked up on every User DB request and health sweep;
+    # several may be active, so the partial index is not unique
+    __table_args__ = (
+        Index('ix_connection_profiles_active', 'id', postgresql_where=is_active == True),
+    )
+    
     def get_connection_string(self, decrypted_password: str = None, decrypted_connection_string: str = None) -> str:
         """Generate connection string from profile."""
         if decrypted_connection_string:
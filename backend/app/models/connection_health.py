@@ -1,21 +1,24 @@
 """
 Connection Health Log Model - Tracks connection health history
 """
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, Text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database import Base
+from app.models.partitioning import partition_by_month
 
 
 class ConnectionHealthLog(Base):
     """Log of connection health checks."""
     __tablename__ = "connection_health_logs"
     
-    id = Column(Integer, primary_key=True, index=True)
+    # Table key is (id, timestamp), as partitioning requires; rows are
+    # still identified by id alone
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     connection_id = Column(Integer, ForeignKey("connection_profiles.id", ondelete="CASCADE"), nullable=False, index=True)
     
     # Health check results
-    timestamp = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    timestamp = Column(DateTime(timezone=True), server_default=func.now(), primary_key=True, index=True)
     status = Column(String(20), nullable=False)  # online, offline, degraded
     response_time_ms = Column(Integer, nullable=True)
     error_message = Column(Text, nullable=True)
@@ -23,5 +26,15 @@ class ConnectionHealthLog(Base):
     # Who triggered the check
     checked_by = Column(String(50), nullable=False, default="system")  # system, user, scheduler
     
-    # Relationship
-    connection = relationship("ConnectionProfile", backref="health_logs")
+    # Relationship; history queries select columns, so nothing loads it
+    connection = relationship("ConnectionProfile", back_populates="health_logs", lazy="raise")
+    
+    # History lookups filter one connection and range over time
+    __table_args__ = (
+        Index('ix_connection_health_logs_connection_timestamp', 'connection_id', 'timestamp'),
+        {'postgresql_partition_by': 'RANGE (timestamp)'},
+    )
+    __mapper_args__ = {'primary_key': [id]}
+
+
+partition_by_month(ConnectionHealthLog.__table__, 'timestamp')
@@ -1,7 +1,7 @@
 """
 Connection Permission Model - Per-connection RBAC
 """
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, ARRAY
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, ARRAY, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -26,7 +26,13 @@ class ConnectionPermission(Base):
     allowed_schemas = Column(ARRAY(String), nullable=True)  # NULL = all schemas
     denied_tables = Column(ARRAY(String), nullable=True)   # NULL = no restrictions
     
-    # Relationships
-    connection = relationship("ConnectionProfile", backref="permissions")
-    user = relationship("User", backref="connection_permissions")
-    role = relationship("Role", backref="connection_permissions")
+    # Relationships; grant checks run EXISTS queries on the ids, so none of
+    # these is loaded implicitly
+    connection = relationship("ConnectionProfile", back_populates="permissions", lazy="raise")
+    user = relationship("User", back_populates="connection_permissions", lazy="raise")
+    role = relationship("Role", back_populates="connection_permissions", lazy="raise")
+    
+    # Permission checks look up one user's grant on one connection
+    __table_args__ = (
+        Index('ix_connection_permissions_connection_user', 'connection_id', 'user_id'),
+    )
@@ -1,7 +1,7 @@
 """
 Dataset, Version, and Column Models
 """
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, JSON, BigInteger, Enum
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index, Text, JSON, BigInteger, Enum
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -151,3 +151,9 @@ class DatasetPermission(Base):
     
     # Relationships
     dataset = relationship("Dataset", back_populates="permissions")
+    
+    # Access checks look up a dataset's grants by user or by role
+    __table_args__ = (
+        Index('ix_dataset_permissions_dataset_user', 'dataset_id', 'user_id', 'can_read'),
+        Index('ix_dataset_permissions_dataset_role', 'dataset_id', 'role_id', 'can_read'),
+    )
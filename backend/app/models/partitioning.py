@@ -0,0 +1,110 @@
+"""
+Monthly range partitioning for append-only log tables (PostgreSQL only)
+"""
+from datetime import date, datetime, timezone
+from typing import Dict, List
+import logging
+
+from sqlalchemy import DDL, Table, event, text
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Partitioned table name -> partition key column
+PARTITIONED_TABLES: Dict[str, str] = {}
+
+
+def _add_months(month_start: date, months: int) -> date:
+    """First day of the month `months` after month_start."""
+    index = month_start.year * 12 + month_start.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _utc_bound(month_start: date) -> str:
+    """Partition bound for midnight UTC on month_start."""
+    return f"{month_start.isoformat()} 00:00+00"
+
+
+def monthly_partition_ddl(table_name: str, month_start: date) -> str:
+    """
+    CREATE statement for the partition holding one calendar month (UTC).
+
+    Bounds carry an explicit offset; a bare date would be read in the
+    session time zone, so sessions in different zones would disagree on
+    where months start and leave gaps or overlaps between partitions.
+    """
+    month_end = _add_months(month_start, 1)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {table_name}_{month_start:%Y_%m} "
+        f"PARTITION OF {table_name} "
+        f"FOR VALUES FROM ('{_utc_bound(month_start)}') TO ('{_utc_bound(month_end)}')"
+    )
+
+
+def partition_by_month(table: Table, column: str) -> None:
+    """
+    Register a table as partitioned by month on column.
+
+    The table itself must declare postgresql_partition_by. When create_all
+    builds it on PostgreSQL, a DEFAULT partition is added so inserts never
+    fail for want of a monthly partition; ensure_monthly_partitions then
+    creates the monthly ones.
+    """
+    PARTITIONED_TABLES[table.name] = column
+    event.listen(
+        table,
+        "after_create",
+        DDL(
+            f"CREATE TABLE IF NOT EXISTS {table.name}_default PARTITION OF {table.name} DEFAULT"
+        ).execute_if(dialect="postgresql")
+    )
+
+
+def ensure_monthly_partitions(engine: Engine, months_ahead: int = 3) -> List[str]:
+    """
+    Create this month's and the next months_ahead months' partitions.
+
+    Months are calendar months in UTC. Skips tables that aren't
+    partitioned (e.g. not migrated yet). A month whose rows already landed
+    in the DEFAULT partition can't get its own partition until those rows
+    are moved out by hand, so any rows found there are logged as an error.
+
+    Returns:
+        Names of the partitions checked or created
+    """
+    if engine.dialect.name != "postgresql":
+        return []
+
+    this_month = datetime.now(timezone.utc).date().replace(day=1)
+    ensured = []
+    with engine.connect() as conn:
+        for table_name in PARTITIONED_TABLES:
+            is_partitioned = conn.execute(
+                text("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:name))"),
+                {"name": table_name}
+            ).scalar()
+            if not is_partitioned:
+                continue
+
+            for offset in range(months_ahead + 1):
+                month_start = _add_months(this_month, offset)
+                try:
+                    conn.execute(text(monthly_partition_ddl(table_name, month_start)))
+                    conn.commit()
+                    ensured.append(f"{table_name}_{month_start:%Y_%m}")
+                except Exception as e:
+                    conn.rollback()
+                    logger.error(f"Could not create partition {table_name}_{month_start:%Y_%m}: {e}")
+
+            column = PARTITIONED_TABLES[table_name]
+            stranded, oldest, newest = conn.execute(text(
+                f'SELECT count(*), min("{column}"), max("{column}") FROM {table_name}_default'
+            )).one()
+            conn.rollback()
+            if stranded:
+                logger.error(
+                    f"{table_name}_default holds {stranded} rows ({oldest} to {newest}); "
+                    f"move them into monthly partitions, or those months' partitions "
+                    f"can't be created"
+                )
+    return ensured
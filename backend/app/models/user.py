@@ -1,7 +1,7 @@
 """
 User, Role, and Permission Models
 """
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Table, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, LargeBinary, Table, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from passlib.context import CryptContext
@@ -44,7 +44,10 @@ class User(Base):
     # Relationships
     roles = relationship("Role", secondary=user_roles, back_populates="users")
     datasets = relationship("Dataset", back_populates="owner")
-    audit_logs = relationship("AuditLog", back_populates="user")
+    # Log and grant rows are cleaned up by their ON DELETE rules; passive
+    # deletes keep the ORM from loading them all when a user is deleted
+    audit_logs = relationship("AuditLog", back_populates="user", lazy="raise", passive_deletes=True)
+    connection_permissions = relationship("ConnectionPermission", back_populates="user", lazy="raise", passive_deletes=True)
     import_jobs = relationship("ImportJob", back_populates="user")
 
     
@@ -57,15 +60,30 @@ class User(Base):
         """Hash a password."""
         return pwd_context.hash(password)
     
+    @property
+    def permission_names(self) -> frozenset:
+        """
+        Names of all permissions granted through the user's roles.
+        
+        Resolved once per instance (users are loaded per request), so
+        repeated permission checks are set lookups instead of role walks.
+        """
+        names = self.__dict__.get('_permission_names')
+        if names is None:
+            names = frozenset(perm.name for role in self.roles for perm in role.permissions)
+            self._permission_names = names
+        return names
+    
+    @permission_names.setter
+    def permission_names(self, names: frozenset) -> None:
+        """Use already resolved permission names (e.g. from a cache)."""
+        self._permission_names = names
+    
     def has_permission(self, permission_name: str) -> bool:
         """Check if user has a specific permission."""
         if self.is_superuser:
             return True
-        for role in self.roles:
-            for perm in role.permissions:
-                if perm.name == permission_name:
-                    return True
-        return False
+        return permission_name in self.permission_names
 
 
 class Role(Base):
@@ -81,6 +99,7 @@ class Role(Base):
     # Relationships
     users = relationship("User", secondary=user_roles, back_populates="roles")
     permissions = relationship("Permission", secondary=role_permissions, back_populates="roles")
+    connection_permissions = relationship("ConnectionPermission", back_populates="role", lazy="raise", passive_deletes=True)
 
 
 class Permission(Base):
@@ -103,7 +122,8 @@ class RefreshToken(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
-    token = Column(String(500), unique=True, nullable=False)
+    token = Column(String(500), nullable=False)
+    token_hash = Column(LargeBinary(32), unique=True, index=True, nullable=False)  # sha256(token), lookup key
     expires_at = Column(DateTime(timezone=True), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     revoked = Column(Boolean, default=False)
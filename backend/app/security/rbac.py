@@ -15,6 +15,17 @@ from app.models.connection import ConnectionProfile
 class ConnectionRBAC:
     """Service for checking and managing connection permissions"""
     
+    @staticmethod
+    def _has_grant(db: Session, user_id: int, connection_id: int, flag=None) -> bool:
+        """Check for a user's ConnectionPermission row, optionally granting flag, via EXISTS"""
+        grant = db.query(ConnectionPermission.id).filter(
+            ConnectionPermission.user_id == user_id,
+            ConnectionPermission.connection_id == connection_id
+        )
+        if flag is not None:
+            grant = grant.filter(flag == True)
+        return db.query(grant.exists()).scalar()
+    
     @staticmethod
     def check_read_permission(
         db: Session,
@@ -31,13 +42,9 @@ class ConnectionRBAC:
             return True
         
         # Check specific permission
-        permission = db.query(ConnectionPermission).filter(
-            ConnectionPermission.user_id == user_id,
-            ConnectionPermission.connection_id == connection_id,
-            ConnectionPermission.can_read == True
-        ).first()
-        
-        return permission is not None
+        return ConnectionRBAC._has_grant(
+            db, user_id, connection_id, ConnectionPermission.can_read
+        )
     
     @staticmethod
     def check_write_permission(
@@ -55,13 +62,9 @@ class ConnectionRBAC:
             return True
         
         # Check specific permission
-        permission = db.query(ConnectionPermission).filter(
-            ConnectionPermission.user_id == user_id,
-            ConnectionPermission.connection_id == connection_id,
-            ConnectionPermission.can_write == True
-        ).first()
-        
-        return permission is not None
+        return ConnectionRBAC._has_grant(
+            db, user_id, connection_id, ConnectionPermission.can_write
+        )
     
     @staticmethod
     def check_execute_permission(
@@ -79,13 +82,9 @@ class ConnectionRBAC:
             return True
         
         # Check specific permission
-        permission = db.query(ConnectionPermission).filter(
-            ConnectionPermission.user_id == user_id,
-            ConnectionPermission.connection_id == connection_id,
-            ConnectionPermission.can_execute_ddl == True
-        ).first()
-        
-        return permission is not None
+        return ConnectionRBAC._has_grant(
+            db, user_id, connection_id, ConnectionPermission.can_execute_ddl
+        )
     
     @staticmethod
     def has_any_permission(
@@ -103,12 +102,7 @@ class ConnectionRBAC:
             return True
         
         # Check if user has any permission
-        permission = db.query(ConnectionPermission).filter(
-            ConnectionPermission.user_id == user_id,
-            ConnectionPermission.connection_id == connection_id
-        ).first()
-        
-        return permission is not None
+        return ConnectionRBAC._has_grant(db, user_id, connection_id)
     
     @staticmethod
     def get_user_connections(
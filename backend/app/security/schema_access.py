@@ -12,6 +12,17 @@ from app.models.user import User
 class SchemaAccessControl:
     """Service for filtering schemas and tables based on permissions"""
     
+    @staticmethod
+    def _get_restrictions(db: Session, user_id: int, connection_id: int):
+        """Load only the schema/table restriction columns of a user's permission row"""
+        return db.query(
+            ConnectionPermission.allowed_schemas,
+            ConnectionPermission.denied_tables
+        ).filter(
+            ConnectionPermission.user_id == user_id,
+            ConnectionPermission.connection_id == connection_id
+        ).first()
+    
     @staticmethod
     def filter_schemas(
         db: Session,
@@ -32,15 +43,12 @@ class SchemaAccessControl:
             List of schemas the user can access
         """
         # Check if user is admin
-        user = db.query(User).filter(User.id == user_id).first()
+        user = db.get(User, user_id)
         if user and user.has_permission("admin:manage"):
             return all_schemas  # Admins see everything
         
         # Get user permission
-        permission = db.query(ConnectionPermission).filter(
-            ConnectionPermission.user_id == user_id,
-            ConnectionPermission.connection_id == connection_id
-        ).first()
+        permission = SchemaAccessControl._get_restrictions(db, user_id, connection_id)
         
         if not permission:
             return []  # No permission = no access
@@ -49,8 +57,9 @@ class SchemaAccessControl:
         if not permission.allowed_schemas:
             return all_schemas
         
-        # Return only allowed schemas
-        return [s for s in all_schemas if s in permission.allowed_schemas]
+        # Return only allowed schemas; set lookups keep this linear
+        allowed = set(permission.allowed_schemas)
+        return [s for s in all_schemas if s in allowed]
     
     @staticmethod
     def filter_tables(
@@ -74,15 +83,12 @@ class SchemaAccessControl:
             List of tables the user can access
         """
         # Check if user is admin
-        user = db.query(User).filter(User.id == user_id).first()
+        user = db.get(User, user_id)
         if user and user.has_permission("admin:manage"):
             return all_tables  # Admins see everything
         
         # Get user permission
-        permission = db.query(ConnectionPermission).filter(
-            ConnectionPermission.user_id == user_id,
-            ConnectionPermission.connection_id == connection_id
-        ).first()
+        permission = SchemaAccessControl._get_restrictions(db, user_id, connection_id)
         
         if not permission:
             return []  # No permission = no access
@@ -96,13 +102,11 @@ class SchemaAccessControl:
             return all_tables
         
         # Filter out denied tables (support both 'table' and 'schema.table' formats)
-        filtered_tables = []
-        for table in all_tables:
-            # Check both plain table name and schema.table format
-            if table not in permission.denied_tables and f"{schema}.{table}" not in permission.denied_tables:
-                filtered_tables.append(table)
-        
-        return filtered_tables
+        denied = set(permission.denied_tables)
+        return [
+            table for table in all_tables
+            if table not in denied and f"{schema}.{table}" not in denied
+        ]
     
     @staticmethod
     def can_access_schema(
@@ -124,15 +128,12 @@ class SchemaAccessControl:
             True if user can access the schema, False otherwise
         """
         # Check if user is admin
-        user = db.query(User).filter(User.id == user_id).first()
+        user = db.get(User, user_id)
         if user and user.has_permission("admin:manage"):
             return True
         
         # Get user permission
-        permission = db.query(ConnectionPermission).filter(
-            ConnectionPermission.user_id == user_id,
-            ConnectionPermission.connection_id == connection_id
-        ).first()
+        permission = SchemaAccessControl._get_restrictions(db, user_id, connection_id)
         
         if not permission:
             return False
@@ -166,15 +167,12 @@ class SchemaAccessControl:
             True if user can access the table, False otherwise
         """
         # Check if user is admin
-        user = db.query(User).filter(User.id == user_id).first()
+        user = db.get(User, user_id)
         if user and user.has_permission("admin:manage"):
             return True
         
         # Get user permission
-        permission = db.query(ConnectionPermission).filter(
-            ConnectionPermission.user_id == user_id,
-            ConnectionPermission.connection_id == connection_id
-        ).first()
+        permission = SchemaAccessControl._get_restrictions(db, user_id, connection_id)
         
         if not permission:
             return False
@@ -208,15 +206,12 @@ class SchemaAccessControl:
             List of accessible schemas, or None if user can access all schemas
         """
         # Check if user is admin
-        user = db.query(User).filter(User.id == user_id).first()
+        user = db.get(User, user_id)
         if user and user.has_permission("admin:manage"):
             return None  # None means all schemas
         
         # Get user permission
-        permission = db.query(ConnectionPermission).filter(
-            ConnectionPermission.user_id == user_id,
-            ConnectionPermission.connection_id == connection_id
-        ).first()
+        permission = SchemaAccessControl._get_restrictions(db, user_id, connection_id)
         
         if not permission:
             return []
@@ -2,7 +2,7 @@
 Audit Service
 Centralized service for logging all system actions
 """
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from sqlalchemy.orm import Session
 from fastapi import Request
 from datetime import datetime
@@ -55,10 +55,11 @@ class AuditService:
         Returns:
             Created AuditLog instance
         """
-        # Get user email if user_id provided
+        # Get user email if user_id provided; the acting user is normally
+        # already in the session, so this rarely needs a query
         user_email = None
         if user_id:
-            user = db.query(User).filter(User.id == user_id).first()
+            user = db.get(User, user_id)
             if user:
                 user_email = user.email
         
@@ -90,9 +91,10 @@ class AuditService:
             rows_affected=rows_affected
         )
         
+        # Flushed, not committed: the request session commits once at the
+        # end (see get_app_db), so the entry shares the action's transaction
         db.add(audit_log)
-        db.commit()
-        db.refresh(audit_log)
+        db.flush()
         
         return audit_log
     
@@ -107,7 +109,8 @@ class AuditService:
         end_date: Optional[datetime] = None,
         success_only: Optional[bool] = None,
         limit: int = 100,
-        offset: int = 0
+        offset: int = 0,
+        columns: Optional[List[str]] = None
     ):
         """
         Query audit logs with filters
@@ -123,11 +126,17 @@ class AuditService:
             success_only: Filter by success status
             limit: Maximum number of results
             offset: Offset for pagination
+            columns: AuditLog column names to select; when given, plain rows
+                with just those attributes are returned instead of ORM
+                objects, skipping instance and identity-map bookkeeping
         
         Returns:
-            List of AuditLog instances
+            List of AuditLog instances (or rows, see columns)
         """
-        query = db.query(AuditLog)
+        if columns:
+            query = db.query(*(getattr(AuditLog, name) for name in columns))
+        else:
+            query = db.query(AuditLog)
         
         if user_id:
             query = query.filter(AuditLog.user_id == user_id)
@@ -75,8 +75,9 @@ class TableEntryAuditLogger:
             created_at=datetime.utcnow()
         )
         
+        # Flush for the id; the request session commits with the operation
         db.add(audit_log)
-        db.commit()
+        db.flush()
         
         logger.info(
             "Table entry operation logged",
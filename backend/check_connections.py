@@ -1,10 +1,7 @@
 import sys
 import os
-import sys
-import os
 from unittest.mock import MagicMock
-from sqlalchemy import Column, Integer, String, Text, Boolean
-from sqlalchemy.orm import declarative_base
+from sqlalchemy import func
 
 # Mock duckdb
 sys.modules['duckdb'] = MagicMock()
@@ -14,24 +11,22 @@ sys.path.append(os.path.join(os.getcwd()))
 
 try:
     from app.database import AppSessionLocal
+    from app.models import ConnectionProfile
 except ImportError as e:
     print(f"Failed to import AppSessionLocal: {e}")
     sys.exit(1)
 
-Base = declarative_base()
-
-class ConnectionProfile(Base):
-    __tablename__ = "connection_profiles"
-    id = Column(Integer, primary_key=True)
-    name = Column(String)
-    db_type = Column(String)
-
 def check_connections():
     db = AppSessionLocal()
     try:
-        connections = db.query(ConnectionProfile).all()
-        print(f"Found {len(connections)} connections:")
-        for conn in connections:
+        total = db.query(func.count(ConnectionProfile.id)).scalar()
+        print(f"Found {total} connections:")
+        # Only three columns are printed, so stream plain rows instead of
+        # hydrating every profile up front
+        rows = db.query(
+            ConnectionProfile.id, ConnectionProfile.name, ConnectionProfile.db_type
+        ).order_by(ConnectionProfile.id).yield_per(100)
+        for conn in rows:
             print(f"- ID: {conn.id}, Name: '{conn.name}', DB Type: {conn.db_type}")
     except Exception as e:
         print(f"Error checking connections: {e}")
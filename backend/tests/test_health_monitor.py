@@ -0,0 +1,143 @@
+"""
+Tests for health log writes
+"""
+import asyncio
+import csv
+import io
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+
+import app.models  # noqa: F401 - registers every mapper
+from app.connections.connectors.base_connector import HealthCheckResult
+from app.connections.health_monitor import HealthMonitor, connection_manager
+from app.models.connection import ConnectionProfile
+from app.models.connection_health import ConnectionHealthLog
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_on_sqlite(type_, compiler, **kw):
+    """Let connection_profiles be created on SQLite"""
+    return "JSON"
+
+
+class StubConnector:
+    """Connector whose health probe returns a fixed result, or raises"""
+
+    def __init__(self, healthy):
+        self.healthy = healthy
+
+    def test_connection(self):
+        if self.healthy is None:
+            raise ConnectionError("probe crashed")
+        return HealthCheckResult(
+            is_healthy=self.healthy,
+            response_time_ms=5,
+            error_message=None if self.healthy else "refused"
+        )
+
+
+class TestHealthLogCopy:
+    """Test the CSV rows streamed to COPY"""
+
+    def test_fields_round_trip(self):
+        """Test quotes, commas and newlines survive CSV parsing"""
+        values = [7, "offline", 1250, 'timeout, "host" down\nretrying', "system"]
+        line = ",".join(HealthMonitor._csv_field(value) for value in values)
+        assert next(csv.reader(io.StringIO(line))) == [str(value) for value in values]
+
+    def test_null_is_unquoted_and_empty_string_is_quoted(self):
+        """Test COPY can tell NULL apart from an empty string"""
+        assert HealthMonitor._csv_field(None) == ""
+        assert HealthMonitor._csv_field("") == '""'
+
+
+class TestMonitorAllConnections:
+    """Test a full health sweep against SQLite (INSERT path)"""
+
+    @pytest.fixture
+    def db(self):
+        """Session with connection_profiles and connection_health_logs, foreign keys enforced"""
+        engine = create_engine("sqlite://")
+        event.listen(engine, "connect", lambda dbapi_conn, _: dbapi_conn.execute("PRAGMA foreign_keys=ON"))
+        ConnectionProfile.metadata.create_all(engine, tables=[ConnectionProfile.__table__])
+        # SQLite can't autoincrement the partitioned (id, timestamp) key, so
+        # the log table is created with id as its only key
+        with engine.begin() as conn:
+            conn.execute(text(
+                "CREATE TABLE connection_health_logs ("
+                "id INTEGER PRIMARY KEY, "
+                "connection_id INTEGER NOT NULL REFERENCES connection_profiles (id) ON DELETE CASCADE, "
+                "timestamp DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP, "
+                "status VARCHAR(20) NOT NULL, "
+                "response_time_ms INTEGER, "
+                "error_message TEXT, "
+                "checked_by VARCHAR(50) NOT NULL)"
+            ))
+        with Session(engine) as session:
+            yield session
+
+    @pytest.fixture
+    def probes(self, monkeypatch):
+        """Map profile name -> probe outcome (True, False, or None to raise)"""
+        outcomes = {}
+        monkeypatch.setattr(
+            connection_manager, "get_connector",
+            lambda profile, *args: StubConnector(outcomes[profile.name])
+        )
+        return outcomes
+
+    def add_profiles(self, db, probes, **outcomes):
+        for name, healthy in outcomes.items():
+            db.add(ConnectionProfile(name=name, database=name, is_active=True))
+            probes[name] = healthy
+        db.commit()
+
+    def logged(self, db):
+        """Status logged per profile name"""
+        rows = db.execute(text(
+            "SELECT p.name, l.status FROM connection_health_logs l "
+            "JOIN connection_profiles p ON p.id = l.connection_id"
+        ))
+        return dict(rows.all())
+
+    def test_sweep_logs_every_connection(self, db, probes):
+        """Test each profile gets a status update and one log row"""
+        self.add_profiles(db, probes, up=True, down=False, broken=None)
+
+        asyncio.run(HealthMonitor().monitor_all_connections(db))
+
+        assert self.logged(db) == {"up": "online", "down": "degraded", "broken": "offline"}
+        statuses = dict(db.query(ConnectionProfile.name, ConnectionProfile.health_status))
+        assert statuses == {"up": "online", "down": "degraded", "broken": "offline"}
+
+    def test_failed_savepoint_queues_no_row(self, db, probes):
+        """Test a connection whose update fails leaves no log row behind"""
+        self.add_profiles(db, probes, up=True, stuck=True)
+        db.execute(text(
+            "CREATE TRIGGER reject_stuck BEFORE UPDATE ON connection_profiles "
+            "WHEN NEW.name = 'stuck' BEGIN SELECT RAISE(ABORT, 'rejected'); END"
+        ))
+        db.commit()
+
+        asyncio.run(HealthMonitor().monitor_all_connections(db))
+
+        assert self.logged(db) == {"up": "online"}
+
+    def test_profile_deleted_mid_sweep(self, db, probes):
+        """Test rows of a profile deleted during the sweep are dropped, the rest written"""
+        self.add_profiles(db, probes, up=True, doomed=True)
+        # Deletes the profile as soon as its health status is recorded
+        db.execute(text(
+            "CREATE TRIGGER delete_doomed AFTER UPDATE ON connection_profiles "
+            "WHEN NEW.name = 'doomed' BEGIN DELETE FROM connection_profiles WHERE id = NEW.id; END"
+        ))
+        db.commit()
+
+        asyncio.run(HealthMonitor().monitor_all_connections(db))
+
+        assert self.logged(db) == {"up": "online"}
+        assert db.query(ConnectionHealthLog).count() == 1
@@ -2,8 +2,10 @@
 Integration tests for MongoDB connector and API
 """
 import pytest
+from datetime import datetime
+from bson import ObjectId
 from pymongo import MongoClient
-from app.connections.connectors.mongodb_connector import MongoDBConnector
+from app.connections.connectors.mongodb_connector import MongoDBConnector, _document_serializer
 from app.models.connection import ConnectionProfile
 
 
@@ -261,5 +263,42 @@ class TestMongoDBAPI:
             assert "execution_time_ms" in result
 
 
+class TestDocumentSerializer:
+    """Test the shape-specialized document serializer (no server needed)"""
+    
+    @pytest.fixture
+    def serialize(self):
+        """Serializer for documents shaped like {_id: ObjectId, name: str, created: datetime}"""
+        return _document_serializer((("_id", ObjectId), ("name", str), ("created", datetime)))
+    
+    def test_matching_shape(self, serialize):
+        """Test ObjectId and datetime fields are converted in place"""
+        oid = ObjectId()
+        created = datetime(2026, 10, 16, 12, 30)
+        doc = {"_id": oid, "name": "a", "created": created}
+        
+        result = serialize(doc)
+        assert result is doc
+        assert result == {"_id": str(oid), "name": "a", "created": "2026-10-16T12:30:00"}
+    
+    def test_different_fields_fall_back(self, serialize):
+        """Test a document with another key set goes through _serialize_value"""
+        oid = ObjectId()
+        doc = {"_id": oid, "tags": [ObjectId("0123456789abcdef01234567")], "meta": {"at": datetime(2026, 1, 1)}}
+        
+        assert serialize(doc) == {
+            "_id": str(oid),
+            "tags": ["0123456789abcdef01234567"],
+            "meta": {"at": "2026-01-01T00:00:00"}
+        }
+    
+    def test_field_type_differs_from_sample(self, serialize):
+        """Test values of another type than the sampled one are still converted"""
+        created_by = ObjectId()
+        doc = {"_id": "custom-id", "name": None, "created": created_by}
+        
+        assert serialize(doc) == {"_id": "custom-id", "name": None, "created": str(created_by)}
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,31 @@
+"""
+Tests for monthly log table partitioning
+"""
+from datetime import date
+
+from sqlalchemy import create_engine
+
+from app.models.partitioning import ensure_monthly_partitions, monthly_partition_ddl
+
+
+class TestMonthlyPartitions:
+    """Test monthly partition DDL"""
+
+    def test_bounds_are_pinned_to_utc(self):
+        """Test bounds carry an explicit UTC offset"""
+        ddl = monthly_partition_ddl("audit_logs", date(2026, 10, 1))
+        assert ddl == (
+            "CREATE TABLE IF NOT EXISTS audit_logs_2026_10 PARTITION OF audit_logs "
+            "FOR VALUES FROM ('2026-10-01 00:00+00') TO ('2026-11-01 00:00+00')"
+        )
+
+    def test_december_rolls_over_to_next_year(self):
+        """Test the upper bound of December is January of the next year"""
+        ddl = monthly_partition_ddl("connection_health_logs", date(2026, 12, 1))
+        assert "connection_health_logs_2026_12" in ddl
+        assert "TO ('2027-01-01 00:00+00')" in ddl
+
+    def test_skipped_on_other_dialects(self):
+        """Test nothing is created outside PostgreSQL"""
+        engine = create_engine("sqlite://")
+        assert ensure_monthly_partitions(engine) == []
@@ -0,0 +1,49 @@
+"""
+Tests for query history recording
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+import app.core.audit as audit
+from app.database import Base
+from app.models.audit import QueryHistory
+from app.core.audit import QueryHistoryManager
+
+
+class TestRecordQuery:
+    """Test QueryHistoryManager.record_query"""
+
+    @pytest.fixture(params=["upsert", "fallback"])
+    def manager(self, request, monkeypatch):
+        """Manager on an in-memory SQLite database, via upsert or the ORM fallback"""
+        if request.param == "fallback":
+            monkeypatch.setattr(audit, "UPSERT_INSERTS", {})
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine, tables=[QueryHistory.__table__])
+        with Session(engine) as db:
+            yield QueryHistoryManager(db)
+
+    def test_running_average(self, manager):
+        """Test each execution updates the count and mean duration"""
+        stats = []
+        for duration in (100, 200, 300, 400):
+            # Every call returns the same row, so read it before the next one
+            entry = manager.record_query(1, "SELECT 1", duration)
+            stats.append((entry.execution_count, entry.avg_duration_ms))
+        assert stats == [
+            (1, 100), (2, 150), (3, 200), (4, 250)
+        ]
+
+    def test_same_query_shares_one_row(self, manager):
+        """Test whitespace and case variants of a query are one history row"""
+        manager.record_query(1, "SELECT 1", 10)
+        manager.record_query(1, "select   1", 20)
+        assert manager.db.query(QueryHistory).count() == 1
+
+    def test_rows_are_per_user(self, manager):
+        """Test the same query run by two users gets a row each"""
+        first = manager.record_query(1, "SELECT 1", 10)
+        second = manager.record_query(2, "SELECT 1", 30)
+        assert first.id != second.id
+        assert (second.execution_count, second.avg_duration_ms) == (1, 30)